@@ -1 +1,67 @@
-# placeholder for ercot_renewables.py
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ERCOT 15-minute fuel mix -> data/ercot_renewables_daily.csv.
+
+Reads 15-minute ERCOT fuel mix CSVs (wide layout: an offset-aware "Interval Start"
+column plus one MW column per fuel, e.g. "Wind", "Solar", "Natural Gas").
+15-minute MW is summed to daily MWh on the ERCOT market day (America/Chicago, DST-aware)
+via the streaming engine in src/iso_ingest.py; already-ingested files are skipped.
+
+Writes: data/ercot_renewables_daily.csv (date, ercot_wind_mwh, ercot_solar_mwh, ercot_gas_mwh)
+
+Example (PowerShell):
+  python -m src.ercot_renewables --input_glob "data/external/ercot_fuel_mix_*.csv" --start 2019-01-01
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from src.iso_ingest import IsoSpec, ingest
+
+OUT = "data/ercot_renewables_daily.csv"
+
+ERCOT_SPEC = IsoSpec(
+    name="ercot",
+    tz="America/Chicago",
+    time_col="Interval Start",
+    time_is_utc=True,
+    interval_hours=0.25,
+    fuels={
+        "ercot_wind_mwh": ("wind",),
+        "ercot_solar_mwh": ("solar",),
+        "ercot_gas_mwh": ("natural gas", "gas", "gas-cc", "gas_cc"),
+    },
+)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input_glob", default="data/external/ercot_fuel_mix_*.csv", help="Glob to ERCOT 15-min fuel mix CSVs")
+    ap.add_argument("--start", default=None)
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--out", default=OUT)
+    ap.add_argument("--workers", type=int, default=None, help="Parallel file workers (default: CPU count)")
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    ap.add_argument("--force", action="store_true", help="Ignore the manifest and re-ingest every file")
+    args = ap.parse_args()
+
+    files = sorted(glob.glob(args.input_glob))
+    if not files:
+        print(f"[ERR] No files matched {args.input_glob}")
+        sys.exit(2)
+
+    try:
+        df = ingest(files, ERCOT_SPEC, start=args.start, end=args.end,
+                    workers=args.workers, chunksize=args.chunksize, force=args.force)
+    except RuntimeError as e:
+        print(f"[ERR] {e}")
+        sys.exit(1)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(f"[OK] Wrote {args.out} rows={len(df)}")
+
+
+if __name__ == "__main__":
+    main()
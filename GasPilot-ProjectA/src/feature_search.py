@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Project A feature search on the Henry Hub table (engine: gaspilot_shared/feature_search.py).
+
+Reads: data/features_eia.csv (or --features; tools/build_features_lite.py)
+Writes: reports/feature_search_h{H}.csv, reports/feature_spec_h{H}.json
+
+Example (PowerShell):
+  python -m src.feature_search --horizons 7 30 --folds 4 --max_features 25
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from gaspilot_shared import feature_search as _engine
+
+FEATURES_PATH = "data/features_eia.csv"
+REPORTS_DIR = "reports"
+TARGET_COL = "henry_hub"
+
+
+def main():
+    _engine.main(FEATURES_PATH, REPORTS_DIR, TARGET_COL, hint="run tools/build_features_lite.py first")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Streaming hourly/sub-hourly ISO generation -> daily MWh ingestion engine.
+
+Used by:
+- src/pjm_gen_by_fuel.py   (PJM hourly gen-by-fuel exports)
+- src/ercot_renewables.py  (ERCOT 15-minute fuel mix exports)
+
+How it works
+- Each raw file is read in chunks (`chunksize`) with column projection (`usecols`),
+  so multi-GB yearly exports never sit fully in memory.
+- Timestamps are assigned to the market-local calendar day:
+    * UTC (or UTC-offset) columns are converted to the ISO timezone before taking the date, so DST days
+      correctly get 23 / 25 hours.
+    * Local wall-clock columns are used as-is (the repeated fall-back hour stays in its day).
+- MW readings are turned into MWh (MW * interval hours) and reduced per (day, output column)
+  with a vectorized groupby-sum. Layouts are either long (one fuel column + one MW column)
+  or wide (one MW column per fuel).
+- Files are processed in parallel (process pool). Each file's daily partial sums are cached
+  under data/external/_ingest/<iso>/ and recorded in a JSON manifest keyed by path, size
+  and mtime; unchanged files are skipped on rerun.
+- The manifest is saved as each file completes (partials stored relative to the manifest),
+  so an interrupted or partly failing run keeps its progress. Failing files are reported and
+  the others still finish; the run then raises so no incomplete table is written.
+
+Output CSV: date + one `<iso>_<fuel>_mwh` column per mapped fuel.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+INGEST_DIR = "data/external/_ingest"
+
+
+@dataclass(frozen=True)
+class IsoSpec:
+    """Column layout and calendar of one ISO export format."""
+    name: str
+    tz: str
+    time_col: str
+    time_is_utc: bool
+    interval_hours: float
+    # output column -> lower-cased source labels (fuel names in long layout, column names in wide)
+    fuels: dict = field(default_factory=dict)
+    fuel_col: str | None = None  # long layout when set
+    value_col: str | None = None  # long layout MW column
+    time_format: str | None = None  # strptime format; falls back to inference if it does not match
+
+    @property
+    def wide(self) -> bool:
+        return self.fuel_col is None
+
+    @property
+    def out_cols(self) -> list:
+        return list(self.fuels)
+
+
+def _label_map(spec: IsoSpec) -> dict:
+    return {label: out for out, labels in spec.fuels.items() for label in labels}
+
+
+def _usecols(spec: IsoSpec):
+    if not spec.wide:
+        return [spec.time_col, spec.fuel_col, spec.value_col]
+    labels = _label_map(spec)
+    return lambda c: c == spec.time_col or c.strip().lower() in labels
+
+
+def _parse_times(ts: pd.Series, spec: IsoSpec) -> pd.Series:
+    if spec.time_format:
+        t = pd.to_datetime(ts, errors="coerce", utc=spec.time_is_utc, format=spec.time_format)
+        if t.notna().any():
+            return t
+    return pd.to_datetime(ts, errors="coerce", utc=spec.time_is_utc)
+
+
+def local_day(ts: pd.Series, spec: IsoSpec) -> pd.Series:
+    """Market-local calendar day (naive datetime64) for each timestamp."""
+    t = _parse_times(ts, spec)
+    if spec.time_is_utc:
+        t = t.dt.tz_convert(spec.tz).dt.tz_localize(None)
+    elif getattr(t.dt, "tz", None) is not None:
+        t = t.dt.tz_convert(spec.tz).dt.tz_localize(None)
+    return t.dt.floor("D")
+
+
+def reduce_chunk(chunk: pd.DataFrame, spec: IsoSpec) -> pd.DataFrame:
+    """Daily MWh partial sums (date, column, mwh) for one chunk."""
+    day = local_day(chunk[spec.time_col], spec)
+    labels = _label_map(spec)
+    if spec.wide:
+        src = {}
+        for c in chunk.columns:
+            if c != spec.time_col:
+                src.setdefault(labels[c.strip().lower()], []).append(c)
+        # several source columns may feed one output column (e.g. gas CC + gas CT)
+        mw = pd.DataFrame({
+            out: chunk[cols].apply(pd.to_numeric, errors="coerce").sum(axis=1, min_count=1)
+            for out, cols in src.items()
+        })
+        long = mw.assign(date=day).melt(id_vars="date", var_name="column", value_name="mw")
+    else:
+        long = pd.DataFrame({
+            "date": day,
+            "column": chunk[spec.fuel_col].astype(str).str.strip().str.lower().map(labels),
+            "mw": pd.to_numeric(chunk[spec.value_col], errors="coerce"),
+        })
+    long = long.dropna(subset=["date", "column", "mw"])
+    long["mwh"] = long["mw"] * spec.interval_hours
+    return long.groupby(["date", "column"], sort=False, observed=True)["mwh"].sum().reset_index()
+
+
+def ingest_file(path: str, spec: IsoSpec, chunksize: int = 1_000_000) -> pd.DataFrame:
+    """Stream one raw file and return its daily partial sums (date, column, mwh)."""
+    parts = [reduce_chunk(c, spec)
+             for c in pd.read_csv(path, usecols=_usecols(spec), chunksize=chunksize, low_memory=False)]
+    if not parts:
+        return pd.DataFrame(columns=["date", "column", "mwh"])
+    # a day can straddle chunk boundaries -> reduce the partials once more
+    return pd.concat(parts, ignore_index=True).groupby(["date", "column"], sort=True)["mwh"].sum().reset_index()
+
+
+def _file_key(path: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _partial_path(spec: IsoSpec, path: str) -> str:
+    h = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(INGEST_DIR, spec.name, f"{h}.csv")
+
+
+def _ingest_to_cache(job):
+    path, spec, chunksize = job
+    daily = ingest_file(path, spec, chunksize=chunksize)
+    cache = _partial_path(spec, path)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    daily.to_csv(cache, index=False)
+    return path, cache, len(daily)
+
+
+def _save_manifest(manifest: dict, manifest_path: str) -> None:
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+
+def ingest(files: list, spec: IsoSpec, start: str | None = None, end: str | None = None,
+           workers: int | None = None, chunksize: int = 1_000_000, force: bool = False) -> pd.DataFrame:
+    """Ingest `files` (skipping unchanged ones per manifest) and return the wide daily table."""
+    manifest_dir = os.path.join(INGEST_DIR, spec.name)
+    manifest_path = os.path.join(manifest_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    todo = []
+    for p in files:
+        rec = manifest.get(os.path.abspath(p))
+        if rec and rec.get("file") == _file_key(p) and os.path.exists(os.path.join(manifest_dir, rec["partial"])):
+            continue
+        todo.append(p)
+    print(f"[INFO] {spec.name}: {len(files)} files, {len(files) - len(todo)} already ingested, {len(todo)} to process")
+
+    failed = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_ingest_to_cache, (p, spec, chunksize)): p for p in todo}
+            for fut in as_completed(futures):
+                p = futures[fut]
+                try:
+                    _, cache, n = fut.result()
+                except Exception as e:
+                    failed.append(p)
+                    print(f"[ERR] {p}: {type(e).__name__}: {e}")
+                    continue
+                manifest[os.path.abspath(p)] = {"file": _file_key(p),
+                                                "partial": os.path.relpath(cache, manifest_dir), "days": n}
+                _save_manifest(manifest, manifest_path)
+                print(f"[OK] ingested {p} days={n}")
+    if failed:
+        raise RuntimeError(f"{spec.name}: {len(failed)} of {len(todo)} files failed to ingest "
+                           f"(the rest are cached; rerun to retry): {', '.join(sorted(failed))}")
+
+    partials = [pd.read_csv(os.path.join(manifest_dir, manifest[os.path.abspath(p)]["partial"]), parse_dates=["date"])
+                for p in files]
+    long = pd.concat(partials, ignore_index=True) if partials else pd.DataFrame(columns=["date", "column", "mwh"])
+    out = long.pivot_table(index="date", columns="column", values="mwh", aggfunc="sum")
+    out = out.reindex(columns=spec.out_cols).rename_axis(columns=None).reset_index()
+    if start:
+        out = out[out["date"] >= pd.Timestamp(start)]
+    if end:
+        out = out[out["date"] <= pd.Timestamp(end)]
+    return out.sort_values("date").reset_index(drop=True)
@@ -1 +1,70 @@
-# placeholder for pjm_gen_by_fuel.py
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""PJM hourly generation by fuel -> data/pjm_fuel_daily.csv.
+
+Reads the yearly/monthly "Gen by Fuel" CSV exports from PJM Data Miner
+(columns: datetime_beginning_utc, fuel_type, mw, ...) dropped in tools/external/.
+Hourly MW is summed to daily MWh on the PJM market day (America/New_York, DST-aware)
+via the streaming engine in src/iso_ingest.py; already-ingested files are skipped.
+
+Writes: data/pjm_fuel_daily.csv (date, pjm_wind_mwh, pjm_solar_mwh, pjm_gas_mwh)
+
+Example (PowerShell):
+  python -m src.pjm_gen_by_fuel --start 2017-01-01 --end 2025-12-01 --input_glob "tools/external/*.csv"
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from src.iso_ingest import IsoSpec, ingest
+
+OUT = "data/pjm_fuel_daily.csv"
+
+PJM_SPEC = IsoSpec(
+    name="pjm",
+    tz="America/New_York",
+    time_col="datetime_beginning_utc",
+    time_is_utc=True,
+    interval_hours=1.0,
+    fuel_col="fuel_type",
+    value_col="mw",
+    time_format="%m/%d/%Y %I:%M:%S %p",
+    fuels={
+        "pjm_wind_mwh": ("wind",),
+        "pjm_solar_mwh": ("solar",),
+        "pjm_gas_mwh": ("gas",),
+    },
+)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input_glob", default="tools/external/*.csv", help="Glob to PJM gen-by-fuel CSV exports")
+    ap.add_argument("--start", default=None)
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--out", default=OUT)
+    ap.add_argument("--workers", type=int, default=None, help="Parallel file workers (default: CPU count)")
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    ap.add_argument("--force", action="store_true", help="Ignore the manifest and re-ingest every file")
+    args = ap.parse_args()
+
+    files = sorted(glob.glob(args.input_glob))
+    if not files:
+        print(f"[ERR] No files matched {args.input_glob}")
+        sys.exit(2)
+
+    try:
+        df = ingest(files, PJM_SPEC, start=args.start, end=args.end,
+                    workers=args.workers, chunksize=args.chunksize, force=args.force)
+    except RuntimeError as e:
+        print(f"[ERR] {e}")
+        sys.exit(1)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(f"[OK] Wrote {args.out} rows={len(df)}")
+
+
+if __name__ == "__main__":
+    main()
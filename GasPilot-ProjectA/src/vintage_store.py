@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Project A point-in-time store (engine: gaspilot_shared/vintage_store.py).
+
+Storage: data/vintages.sqlite
+
+CLI (PowerShell):
+  python -m src.vintage_store --series henry_hub --as_of 2023-06-01 --out data/henry_hub_asof_20230601.csv
+  python -m src.vintage_store --list
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from gaspilot_shared import vintage_store as _engine
+from gaspilot_shared.vintage_store import VintageStore  # noqa: F401  (re-exported for tools/)
+
+DEFAULT_DB = Path("data") / "vintages.sqlite"
+
+
+def main():
+    _engine.main(DEFAULT_DB)
+
+
+if __name__ == "__main__":
+    main()
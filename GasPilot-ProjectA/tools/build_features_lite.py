@@ -2,30 +2,44 @@
 # -*- coding: utf-8 -*-
 """Builds a real-data feature table for Project A.
 
-Anchors to a daily calendar over Henry Hub availability, then merges:
+Anchors to a daily calendar over Henry Hub availability, then as-of joins (gaspilot_shared/asof_join.py):
 - data/eia_henryhub.csv (required)
 - data/pjm_fuel_daily.csv (required)
 - data/eu_storage.csv (optional; level_pct)
 - data/cpc_610_us.csv, data/cpc_814_us.csv (optional; index)
 
+Each source is shifted by its publication lag and forward-filled only (no backward fill),
+so a row never sees a value that was not yet published on its date. Days before a source's
+first publication stay NaN; train_predict_lite imputes them.
+
+Henry Hub lags and targets are taken on calendar days from the last traded price (weekends and
+holidays carry the previous settlement), so target_t+H is the price in force H days later.
+Only trading days (observed price) are written; a row is kept even if some horizon's target is
+still in the future (NaN), and train_predict_lite drops NaN targets per horizon.
+
 Outputs:
 - data/features_eia.csv (includes date, feature columns, and targets target_t+7 / target_t+30)
 """
 
 import os
 import sys
-import numpy as np
+import argparse
 import pandas as pd
 
-REQUIRED = [
-    "data/eia_henryhub.csv",
-    "data/pjm_fuel_daily.csv",
-]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.dirname(ROOT))  # repo root: gaspilot_shared/
+from gaspilot_shared.asof_join import Source, asof_join
 
-OPTIONAL = [
-    "data/eu_storage.csv",
-    "data/cpc_610_us.csv",
-    "data/cpc_814_us.csv",
+ANCHOR = "data/eia_henryhub.csv"
+
+# Feature sources with publication lags (days after the observation date the value is known):
+# PJM daily fuel mix and AGSI gas-day storage are published the next day; CPC outlooks on issue date.
+SOURCES = [
+    Source("data/pjm_fuel_daily.csv", freq="D", lag_days=1, required=True),
+    Source("data/eu_storage.csv", freq="D", lag_days=1),
+    Source("data/cpc_610_us.csv", freq="D", lag_days=0, rename={"index": "cpc_610_idx"}),
+    Source("data/cpc_814_us.csv", freq="D", lag_days=0, rename={"index": "cpc_814_idx"}),
 ]
 
 
@@ -38,64 +52,45 @@ def rd(path: str, must: bool = True):
 
 
 def main():
+    argparse.ArgumentParser(description="Build data/features_eia.csv from the fetched Henry Hub, PJM, "
+                                        "AGSI and CPC inputs.").parse_args()
     os.makedirs("data", exist_ok=True)
 
-    hh = rd(REQUIRED[0], must=True)
-    pjm = rd(REQUIRED[1], must=True)
-    if hh is None or pjm is None:
+    hh = rd(ANCHOR, must=True)
+    frames = [(src, rd(src.name, must=src.required)) for src in SOURCES]
+    if hh is None or any(df is None for src, df in frames if src.required):
         sys.exit(2)
-
-    eu = rd(OPTIONAL[0], must=False)
-    c610 = rd(OPTIONAL[1], must=False)
-    c814 = rd(OPTIONAL[2], must=False)
+    frames = [(src, df) for src, df in frames if df is not None]
 
     # Continuous daily grid on Henry Hub window
     hh = hh.sort_values("date").reset_index(drop=True)
     full_dates = pd.date_range(hh["date"].min(), hh["date"].max(), freq="D")
     hh = hh.set_index("date").reindex(full_dates).rename_axis("date").reset_index()
 
-    # Merge all features LEFT onto HH calendar
-    df = hh.merge(pjm, on="date", how="left")
-    if eu is not None:
-        df = df.merge(eu, on="date", how="left")
-    if c610 is not None:
-        if "index" in c610.columns:
-            c610 = c610.rename(columns={"index": "cpc_610_idx"})
-        df = df.merge(c610, on="date", how="left")
-    if c814 is not None:
-        if "index" in c814.columns:
-            c814 = c814.rename(columns={"index": "cpc_814_idx"})
-        df = df.merge(c814, on="date", how="left")
-
-    # Fill feature gaps (not target)
-    fill_cols = [c for c in df.columns if c not in ["date", "henry_hub"]]
-    if fill_cols:
-        df[fill_cols] = df[fill_cols].ffill().bfill()
-
-    num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if num_cols:
-        df[num_cols] = df[num_cols].fillna(0.0)
+    # One as-of pass of all feature sources onto the HH calendar (forward-fill only,
+    # respecting publication lags), then attach to the anchor
+    feats = asof_join(full_dates, frames)
+    df = pd.concat([hh, feats.drop(columns="date")], axis=1)
 
     # Calendar + lag features
     df["dow"] = df["date"].dt.dayofweek
     df["month"] = df["date"].dt.month
     df["is_wknd"] = (df["dow"] >= 5).astype(int)
 
+    # last traded price on every calendar day, so Monday's lag1 is Friday's settlement
+    last_px = df["henry_hub"].ffill()
     for lag in (1, 7, 14):
-        df[f"henry_hub_lag{lag}"] = df["henry_hub"].shift(lag)
+        df[f"henry_hub_lag{lag}"] = last_px.shift(lag)
 
     df["henry_hub_ma7"] = df["henry_hub"].rolling(7, min_periods=1).mean()
     df["henry_hub_ma30"] = df["henry_hub"].rolling(30, min_periods=1).mean()
 
     # Targets
     for H in (7, 30):
-        df[f"target_t+{H}"] = df["henry_hub"].shift(-H)
+        df[f"target_t+{H}"] = last_px.shift(-H)
 
-    # Keep only rows where HH and targets exist
-    keep = df["henry_hub"].notna()
-    for H in (7, 30):
-        keep &= df[f"target_t+{H}"].notna()
-    df = df[keep].reset_index(drop=True)
+    # Keep trading days only; NaN targets (last H days) are filtered per horizon downstream
+    df = df[df["henry_hub"].notna()].reset_index(drop=True)
 
     out = "data/features_eia.csv"
     df.to_csv(out, index=False)
@@ -3,43 +3,61 @@
 """Simple EIA v2 Henry Hub (RNGWHHD) fetcher.
 
 Writes: data/eia_henryhub.csv (date, henry_hub)
+Also appends the fetch to the point-in-time store data/vintages.sqlite (series "henry_hub").
 Requires: env var EIA_API_KEY
 """
 
 import os
 import sys
-import requests
+import argparse
 import pandas as pd
 
-API = os.environ.get("EIA_API_KEY", "").strip()
-if not API:
-    print("[ERR] EIA_API_KEY not set")
-    sys.exit(2)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.vintage_store import VintageStore, DEFAULT_DB
 
 URL = "https://api.eia.gov/v2/natural-gas/pri/fut/data/"
-PARAMS = {
-    "frequency": "daily",
-    "data[0]": "value",
-    "facets[series][]": "RNGWHHD",
-    "start": "2017-01-01",
-    "sort[0][column]": "period",
-    "sort[0][direction]": "asc",
-    "api_key": API,
-}
-
-r = requests.get(URL, params=PARAMS, timeout=90)
-r.raise_for_status()
-js = r.json()
-rows = js.get("response", {}).get("data", [])
-if not rows:
-    print("[ERR] No rows returned from EIA v2 endpoint")
-    sys.exit(3)
-
-df = pd.DataFrame(rows).rename(columns={"period": "date", "value": "henry_hub"})
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
-df = df[["date", "henry_hub"]].dropna().sort_values("date").reset_index(drop=True)
-
-os.makedirs("data", exist_ok=True)
-out = "data/eia_henryhub.csv"
-df.to_csv(out, index=False)
-print(f"[OK] Wrote {out} rows={len(df)}")
+
+
+def main():
+    argparse.ArgumentParser(description="Fetch EIA v2 Henry Hub (RNGWHHD) into data/eia_henryhub.csv.").parse_args()
+
+    API = os.environ.get("EIA_API_KEY", "").strip()
+    if not API:
+        print("[ERR] EIA_API_KEY not set")
+        sys.exit(2)
+
+    PARAMS = {
+        "frequency": "daily",
+        "data[0]": "value",
+        "facets[series][]": "RNGWHHD",
+        "start": "2017-01-01",
+        "sort[0][column]": "period",
+        "sort[0][direction]": "asc",
+        "api_key": API,
+    }
+
+    import requests
+    r = requests.get(URL, params=PARAMS, timeout=90)
+    r.raise_for_status()
+    js = r.json()
+    rows = js.get("response", {}).get("data", [])
+    if not rows:
+        print("[ERR] No rows returned from EIA v2 endpoint")
+        sys.exit(3)
+
+    df = pd.DataFrame(rows).rename(columns={"period": "date", "value": "henry_hub"})
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df[["date", "henry_hub"]].dropna().sort_values("date").reset_index(drop=True)
+
+    os.makedirs("data", exist_ok=True)
+    out = "data/eia_henryhub.csv"
+    df.to_csv(out, index=False)
+    print(f"[OK] Wrote {out} rows={len(df)}")
+
+    with VintageStore(DEFAULT_DB) as store:
+        n = store.append("henry_hub", df, value_col="henry_hub", source="eia:RNGWHHD")
+    print(f"[OK] vintage henry_hub: {n} new/revised rows")
+
+
+if __name__ == "__main__":
+    main()
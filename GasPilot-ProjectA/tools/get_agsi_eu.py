@@ -9,6 +9,8 @@
 Notes
 - AGSI paging: the API returns paging metadata; you must iterate ?page=1..last_page.
 - Output is daily with columns: date, level_pct (0-100).
+- API fetches are also appended to the point-in-time store data/vintages.sqlite
+  (series "eu_storage_level_pct"), so revisions are kept instead of overwritten.
 
 Env vars
 - AGSI_API_KEY: required for API mode
@@ -17,10 +19,13 @@ Env vars
 
 import os
 import sys
+import argparse
 import pandas as pd
-import requests
 from datetime import datetime, UTC
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.vintage_store import VintageStore, DEFAULT_DB
+
 OUT = "data/eu_storage.csv"
 FALLBACK = "data/external/eu_storage_fallback.csv"
 
@@ -45,6 +50,7 @@ def use_fallback():
 
 def fetch_all_pages(base_url: str, headers: dict, params: dict) -> list:
     """AGSI returns paging metadata; iterate page=1..last_page."""
+    import requests
     items = []
 
     p0 = dict(params)
@@ -138,8 +144,13 @@ def fetch_agsi():
     out = normalize_df(raw)
     write_csv(out)
 
+    with VintageStore(DEFAULT_DB) as store:
+        n = store.append("eu_storage_level_pct", out, value_col="level_pct", source="agsi")
+    print(f"[OK] vintage eu_storage_level_pct: {n} new/revised rows")
+
 
 if __name__ == "__main__":
+    argparse.ArgumentParser(description="Fetch aggregated EU gas storage (AGSI) into data/eu_storage.csv.").parse_args()
     try:
         fetch_agsi()
     except KeyboardInterrupt:
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Merge manual PJM "Gen by Fuel" downloads into data/pjm_fuel_daily.csv.
+
+Thin wrapper around src/pjm_gen_by_fuel.py (chunked, parallel, manifest-skipping ingestion).
+
+Writes: data/pjm_fuel_daily.csv (date, pjm_wind_mwh, pjm_solar_mwh, pjm_gas_mwh)
+
+Usage:
+  python tools/get_pjm_gen_by_fuel.py --start 2017-01-01 --end 2025-12-01 --input_glob "tools/external/*.csv"
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pjm_gen_by_fuel import main
+
+if __name__ == "__main__":
+    main()
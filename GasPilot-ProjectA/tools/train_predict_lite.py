@@ -15,14 +15,9 @@ Outputs:
 
 import os
 import argparse
-import joblib
 import numpy as np
 import pandas as pd
 
-from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
-from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
-
 MODELS_DIR = "models"
 REPORTS_DIR = "reports"
 FEATURES_PATH = "data/features_eia.csv"
@@ -66,7 +61,12 @@ def build_Xy(df: pd.DataFrame, H: int):
     return X, y, keep
 
 
-def make_model(name: str) -> Pipeline:
+def make_model(name: str):
+    # sklearn is imported on first use so `--help` (and gaspilot) start fast
+    from sklearn.pipeline import Pipeline
+    from sklearn.impute import SimpleImputer
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
     if name == "gbm":
         base = GradientBoostingRegressor(random_state=42)
     elif name == "rf":
@@ -80,7 +80,7 @@ def make_model(name: str) -> Pipeline:
     ])
 
 
-def make_forecast(df: pd.DataFrame, pipe: Pipeline, H: int, keep_mask: pd.Series) -> pd.DataFrame:
+def make_forecast(df: pd.DataFrame, pipe, H: int, keep_mask: pd.Series) -> pd.DataFrame:
     date_input = df.loc[keep_mask, "date"].reset_index(drop=True)
     target_date = date_input + pd.to_timedelta(H, unit="D")
 
@@ -107,6 +107,7 @@ def main():
     ap.add_argument("--horizons", nargs="+", type=int, default=[7, 30])
     ap.add_argument("--models", nargs="+", default=["gbm", "rf"], choices=["gbm", "rf"])
     args = ap.parse_args()
+    import joblib
 
     ensure_dirs()
     df = load_features()
@@ -0,0 +1,151 @@
+"""Progressive (approximate-first) walk-forward backtest against a baseline model.
+
+Instead of running every fold in date order, folds are evaluated in a stratified order
+that spreads early folds across seasons (DJF/MAM/JJA/SON) and years. After every
+`--check_every` folds, MAE/RMSE are reported with fold-bootstrap confidence bands, for the
+model, the baseline and their MAE difference. The run stops early once the difference
+band excludes zero (the comparison is decided), or continues until all folds are done.
+Bands are re-checked at every look without multiplicity correction; lower --alpha for a
+stricter stopping rule.
+
+Reads: data/features_lng.csv
+Writes (streamed while folds complete):
+  reports/progressive_h{H}_{model}_vs_{baseline}.csv  (date_input, target_date, y_true, y_hat, y_hat_{baseline}, fold)
+  reports/progress_h{H}_{model}_vs_{baseline}.csv
+      (folds, rows, mae, mae_lo, mae_hi, rmse, rmse_lo, rmse_hi, mae_base, mae_base_lo, mae_base_hi,
+       mae_diff, mae_diff_lo, mae_diff_hi, decided)
+The fold file is re-sorted by date_input when the run finishes. It is kept apart from
+train_lng's reports/backtest_h{H}_{model}.csv (an early-stopped run covers only some folds),
+and src/report_metrics.py does not pick it up.
+
+Example (PowerShell):
+  python -m src.backtest_progressive --model hgb --baseline ridge --horizons 7 30
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from src import config
+from src.train_lng import backtest_inputs, fold_starts, make_model, run_fold
+
+SEASON = {12: "DJF", 1: "DJF", 2: "DJF", 3: "MAM", 4: "MAM", 5: "MAM",
+          6: "JJA", 7: "JJA", 8: "JJA", 9: "SON", 10: "SON", 11: "SON"}
+
+def stratified_order(starts: list, dates: pd.Series, seed: int = 42) -> list:
+    """Fold starts reordered round-robin over (year, season) strata, shuffled within each."""
+    rng = np.random.default_rng(seed)
+    strata = {}
+    for i in starts:
+        d = dates.iloc[i]
+        strata.setdefault((d.year, SEASON[d.month]), []).append(i)
+    queues = [list(rng.permutation(v)) for _, v in sorted(strata.items())]
+    order = []
+    while any(queues):
+        for q in rng.permutation(len(queues)):
+            if queues[q]:
+                order.append(int(queues[q].pop()))
+    return order
+
+def bootstrap_metrics(stats: np.ndarray, n_boot: int, alpha: float, seed: int = 0) -> dict:
+    """Point estimates and percentile bands from per-fold sums.
+
+    stats columns: n, sum|e|, sum e^2 (model), sum|e| (baseline). Folds are resampled with
+    replacement, so within-fold error correlation is kept.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(stats)
+    idx = rng.integers(0, k, size=(n_boot, k))
+    boot = stats[idx].sum(axis=1)
+    tot = stats.sum(axis=0)
+
+    def band(point, samples):
+        lo, hi = np.quantile(samples, [alpha / 2, 1 - alpha / 2])
+        return point, lo, hi
+
+    out = {}
+    for name, pt, smp in [
+        ("mae", tot[1] / tot[0], boot[:, 1] / boot[:, 0]),
+        ("rmse", np.sqrt(tot[2] / tot[0]), np.sqrt(boot[:, 2] / boot[:, 0])),
+        ("mae_base", tot[3] / tot[0], boot[:, 3] / boot[:, 0]),
+        ("mae_diff", (tot[1] - tot[3]) / tot[0], (boot[:, 1] - boot[:, 3]) / boot[:, 0]),
+    ]:
+        out[name], out[f"{name}_lo"], out[f"{name}_hi"] = band(pt, smp)
+    return out
+
+def progressive_backtest(df: pd.DataFrame, H: int, model_name: str, baseline: str,
+                         min_train_days: int = 365, step: int = 7, min_folds: int = 8,
+                         check_every: int = 4, n_boot: int = 1000, alpha: float = 0.05) -> pd.DataFrame:
+    X, y, dates = backtest_inputs(df, H)
+    starts = fold_starts(len(X), min_train_days, step)
+    if not starts:
+        print(f"[WARN] h{H}: {len(X)} rows leave no folds after min_train_days={min_train_days}; skipped")
+        return pd.DataFrame()
+    order = stratified_order(starts, dates)
+    model, base = make_model(model_name), make_model(baseline)
+
+    bt_path = config.REPORTS_DIR / f"progressive_h{H}_{model_name}_vs_{baseline}.csv"
+    pr_path = config.REPORTS_DIR / f"progress_h{H}_{model_name}_vs_{baseline}.csv"
+    for p in (bt_path, pr_path):
+        p.unlink(missing_ok=True)
+
+    stats, progress = [], []
+    for k, i in enumerate(order, start=1):
+        y_test = y.iloc[i:i+step].to_numpy()
+        y_hat = run_fold(model, X, y, dates, i, step)
+        y_base = run_fold(base, X, y, dates, i, step)
+        e, eb = y_hat - y_test, y_base - y_test
+        stats.append((len(e), np.abs(e).sum(), (e ** 2).sum(), np.abs(eb).sum()))
+
+        date_input = dates.iloc[i:i+step].reset_index(drop=True)
+        pd.DataFrame({
+            "date_input": date_input,
+            "target_date": date_input + pd.to_timedelta(H, unit="D"),
+            "y_true": y_test,
+            "y_hat": y_hat,
+            f"y_hat_{baseline}": y_base,
+            "fold": i,
+        }).to_csv(bt_path, mode="a", header=not bt_path.exists(), index=False)
+
+        if k % check_every and k != len(order):
+            continue
+        m = bootstrap_metrics(np.asarray(stats, dtype=float), n_boot, alpha)
+        decided = k >= min_folds and (m["mae_diff_hi"] < 0 or m["mae_diff_lo"] > 0)
+        row = {"folds": k, "rows": int(sum(s[0] for s in stats)), **m, "decided": decided}
+        progress.append(row)
+        pd.DataFrame([row]).to_csv(pr_path, mode="a", header=not pr_path.exists(), index=False)
+        print(f"[INFO] h{H} {model_name} vs {baseline}: folds {k}/{len(order)} "
+              f"MAE {m['mae']:.4f} [{m['mae_lo']:.4f}, {m['mae_hi']:.4f}] "
+              f"base {m['mae_base']:.4f} diff {m['mae_diff']:+.4f} [{m['mae_diff_lo']:+.4f}, {m['mae_diff_hi']:+.4f}]")
+        if decided:
+            better = model_name if m["mae_diff_hi"] < 0 else baseline
+            print(f"[OK] decided after {k}/{len(order)} folds: {better} has lower MAE")
+            break
+
+    bt = pd.read_csv(bt_path, parse_dates=["date_input", "target_date"]).sort_values("date_input")
+    bt.to_csv(bt_path, index=False)
+    print(f"[OK] wrote {bt_path} rows={len(bt)} and {pr_path}")
+    return pd.DataFrame(progress)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="hgb", choices=["hgb","rf","ridge"])
+    ap.add_argument("--baseline", default="ridge", choices=["hgb","rf","ridge"])
+    ap.add_argument("--horizons", nargs="+", type=int, default=[7,30])
+    ap.add_argument("--min_train_days", type=int, default=365)
+    ap.add_argument("--step", type=int, default=7)
+    ap.add_argument("--min_folds", type=int, default=8, help="Never stop before this many folds.")
+    ap.add_argument("--check_every", type=int, default=4, help="Re-estimate metrics every N folds.")
+    ap.add_argument("--n_boot", type=int, default=1000)
+    ap.add_argument("--alpha", type=float, default=0.05, help="Band level (0.05 -> 95%% bands).")
+    args = ap.parse_args()
+    if args.model == args.baseline:
+        ap.error("--model and --baseline must differ")
+
+    df = pd.read_csv(config.DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+    for H in args.horizons:
+        dfH = df.loc[df[f"target_t+{H}"].notna()].reset_index(drop=True)
+        progressive_backtest(dfH, H, args.model, args.baseline, min_train_days=args.min_train_days,
+                             step=args.step, min_folds=args.min_folds, check_every=args.check_every,
+                             n_boot=args.n_boot, alpha=args.alpha)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
+"""Project paths.
+
+Importing this module has no side effects: the data/model/report directories are
+created on first access (e.g. `from src.config import MODELS_DIR`), so lightweight
+entry points such as `gaspilot --help` never touch the filesystem. It does put the
+repository root on sys.path, so the engines shared with Project A (gaspilot_shared/)
+import from `python -m src.x`, tools/ and gaspilot.py alike.
+"""
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-DATA_DIR = PROJECT_ROOT / "data"
-EXTERNAL_DIR = DATA_DIR / "external"
-MODELS_DIR = PROJECT_ROOT / "models"
-REPORTS_DIR = PROJECT_ROOT / "reports"
+REPO_ROOT = PROJECT_ROOT.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+_DIRS = {
+    "DATA_DIR": PROJECT_ROOT / "data",
+    "EXTERNAL_DIR": PROJECT_ROOT / "data" / "external",
+    "MODELS_DIR": PROJECT_ROOT / "models",
+    "REPORTS_DIR": PROJECT_ROOT / "reports",
+}
 
-for p in [DATA_DIR, EXTERNAL_DIR, MODELS_DIR, REPORTS_DIR]:
-    p.mkdir(parents=True, exist_ok=True)
+def __getattr__(name: str) -> Path:
+    if name in _DIRS:
+        p = _DIRS[name]
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,20 @@
+"""Project B feature search on the LNG feed-gas table (engine: gaspilot_shared/feature_search.py).
+
+Reads: data/features_lng.csv (or --features)
+Writes: reports/feature_search_h{H}.csv, reports/feature_spec_h{H}.json
+
+Example (PowerShell):
+  python -m src.feature_search --horizons 7 30 --folds 4 --max_features 25
+"""
+from src import config  # also puts the repo root (gaspilot_shared/) on sys.path
+from gaspilot_shared import feature_search as _engine
+
+TARGET_COL = "y"
+
+def main():
+    # plain paths, not config.*_DIR: those create the folders, and the engine parses --help first
+    _engine.main(config.PROJECT_ROOT / "data" / "features_lng.csv", config.PROJECT_ROOT / "reports", TARGET_COL,
+                 hint="run python -m src.features_lng first")
+
+if __name__ == "__main__":
+    main()
@@ -7,23 +7,87 @@ Inputs (CSV):
   data/external/outages.csv            (date, outage_flag or outage_pct) optional
   data/external/weather_us.csv         (date, hdd, cdd, temp) optional
 
+Panel input (CSV, long format, used with --panel):
+  data/external/<panel>.csv            (date, series_id, value) e.g. one series per terminal
+
 Outputs:
-  data/features_lng.csv  (date + engineered features + targets for horizons)
+  data/features_lng.csv        (date + engineered features + targets for horizons)
+  data/features_lng_panel.csv  (panel mode: date, series_id, series_code + same features/targets)
+  data/features_lng_{tag}.csv  (intraday mode, --freq H|15min; tag = hourly|15min)
 
 Design:
   - Anchors on target series (feedgas_bcf_d by default)
-  - Daily reindexing with ffill/bfill for slowly varying features
+  - Covariates are as-of joined onto the daily grid in one pass (gaspilot_shared/asof_join.py): each source
+    declares frequency + publication lag and is forward-filled only, so no future values leak back.
+    Days before a source's first publication are left NaN rather than a fake 0.0 observation.
+    Override per source with --sources '{"lng_exports.csv": {"freq": "M", "date_is": "start", "lag_days": 60}}'
+  - Shared covariates (AIS, outages, weather, exports) are built once on the daily grid;
+    in panel mode the per-series lag/rolling features use grouped ops over all series at once
+  - Intraday mode (--freq H or 15min): the target is resampled to the grid, lags/windows/horizons
+    are counted in grid steps (FREQS), daily covariates are built as above and carried onto every
+    step of their day. Rows are written in --chunk_rows chunks as float32, so memory stays bounded
+    by the chunk size rather than the 24x / 96x longer history.
   - QA columns: date_input and target_date are created in forecast step.
 """
 import argparse
+import time
+from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from src.config import DATA_DIR, EXTERNAL_DIR
-from src.utils import backfill_daily, save_csv
+from src import config
+from src.utils import backfill_daily, save_csv, try_json_load, peak_rss_mb
+from gaspilot_shared.asof_join import Source, asof_join, with_overrides
+
+# Publication lags: daily AIS counts and observed weather are final the next day.
+COVARIATE_SOURCES = [
+    Source("ais_daily.csv", freq="D", lag_days=1),
+    Source("outages.csv", freq="D", lag_days=0),
+    Source("weather_us.csv", freq="D", lag_days=1),
+    Source("lng_exports.csv", freq="D", lag_days=1),
+]
+Y_LAGS = (1, 2, 7, 14)
+Y_WINDOWS = (7, 30)
+DEP_WINDOWS = (7, 14)
+PANEL_FEATURES = "features_lng_panel.csv"
+
+@dataclass(frozen=True)
+class FreqSpec:
+    alias: str          # pandas offset alias of the grid
+    tag: str            # suffix of feature/report/model file names
+    per_day: int        # grid steps per day
+    lags: tuple         # y lags, in steps
+    windows: tuple      # y rolling-mean windows, in steps
+    horizons: tuple     # default forecast horizons, in steps
+
+    @property
+    def delta(self) -> pd.Timedelta:
+        return pd.Timedelta(days=1) / self.per_day
+
+# Intraday grids: previous steps, same time yesterday / last week, daily and weekly means.
+FREQS = {
+    "H": FreqSpec("h", "hourly", 24, (1, 2, 3, 24, 48, 168), (24, 168), (24, 168)),
+    "15min": FreqSpec("15min", "15min", 96, (1, 2, 4, 96, 192, 672), (16, 96, 672), (96, 672)),
+}
+
+def features_path(freq: str = "D") -> Path:
+    if freq == "D":
+        return config.DATA_DIR / "features_lng.csv"
+    return config.DATA_DIR / f"features_lng_{FREQS[freq].tag}.csv"
+
+def derived_features() -> list:
+    """Dependency graph of engineered features: (derived col, input col, op, window).
+
+    ops: "lag" (shift by window), "sum" / "mean" (trailing rolling, min_periods=1).
+    Used by src/scenario_lng.py to propagate shocks on inputs to their derived columns.
+    """
+    spec = [(f"dep_{w}d", "departures", "sum", w) for w in DEP_WINDOWS]
+    spec += [(f"y_lag{lag}", "y", "lag", lag) for lag in Y_LAGS]
+    spec += [(f"y_ma{w}", "y", "mean", w) for w in Y_WINDOWS]
+    return spec
 
 def load_csv(name: str, required: bool = False) -> pd.DataFrame | None:
-    p = EXTERNAL_DIR / name
+    p = config.EXTERNAL_DIR / name
     if not p.exists():
         if required:
             raise FileNotFoundError(f"Missing {p}")
@@ -32,13 +96,77 @@ def load_csv(name: str, required: bool = False) -> pd.DataFrame | None:
     df["date"] = pd.to_datetime(df["date"]).dt.tz_localize(None)
     return df
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--target", default="lng_feedgas.csv", help="Target series CSV in data/external/")
-    ap.add_argument("--target_col", default="feedgas_bcf_d")
-    ap.add_argument("--horizons", nargs="+", type=int, default=[7,30])
-    args = ap.parse_args()
+def build_covariates(dates: pd.DatetimeIndex, overrides: dict | None = None) -> pd.DataFrame:
+    """Shared (series-independent) covariates aligned to a daily date grid.
+
+    Returns a frame with a `date` column followed by the optional inputs, calendar
+    columns and AIS rolling sums. Built once and joined onto every target series.
+    """
+    frames = []
+    for src in with_overrides(COVARIATE_SOURCES, overrides or {}):
+        other = load_csv(src.name, required=src.required)
+        if other is not None:
+            frames.append((src, other))
+    # days before a source's first publication stay NaN (imputed in train_lng, native in hgb)
+    cov = asof_join(dates, frames)
+
+    cov["dow"] = cov["date"].dt.dayofweek
+    cov["month"] = cov["date"].dt.month
+    cov["is_wknd"] = (cov["dow"]>=5).astype(int)
+
+    # If AIS exists, add rolling sums
+    if "departures" in cov.columns:
+        for w in DEP_WINDOWS:
+            cov[f"dep_{w}d"] = cov["departures"].rolling(w, min_periods=1).sum()
+    return cov
+
+def add_target_features(df: pd.DataFrame, horizons, by: str | None = None) -> pd.DataFrame:
+    """Lag/rolling features on `y` and forward targets; grouped by `by` when given.
+
+    `df` must be sorted by (`by`, date) with one row per day per group.
+    """
+    y = df["y"] if by is None else df.groupby(by, sort=False)["y"]
+
+    for lag in Y_LAGS:
+        df[f"y_lag{lag}"] = y.shift(lag)
+    for w in Y_WINDOWS:
+        roll = y.rolling(w, min_periods=1).mean()
+        if by is not None:
+            roll = roll.reset_index(level=0, drop=True)
+        df[f"y_ma{w}"] = roll
+
+    for H in horizons:
+        df[f"target_t+{H}"] = y.shift(-H)
+
+    # Keep rows where targets exist
+    keep = df["y"].notna()
+    for H in horizons:
+        keep &= df[f"target_t+{H}"].notna()
+    return df.loc[keep].reset_index(drop=True)
 
+def load_panel(name: str) -> pd.DataFrame:
+    """Read a long-format (date, series_id, value) file and put each series on a daily grid."""
+    raw = load_csv(name, required=True)
+    need = {"date", "series_id", "value"}
+    if not need.issubset(raw.columns):
+        raise ValueError(f"Panel file must contain columns {sorted(need)}; got {list(raw.columns)}")
+    raw = raw[["date", "series_id", "value"]].dropna(subset=["date", "series_id"])
+    raw["series_id"] = raw["series_id"].astype(str)
+    # duplicate (series, date) rows are averaged so every group has one row per day
+    raw = raw.groupby(["series_id", "date"], sort=True)["value"].mean().reset_index()
+
+    bounds = raw.groupby("series_id")["date"].agg(["min", "max"])
+    grid = pd.concat(
+        [pd.DataFrame({"series_id": sid, "date": pd.date_range(lo, hi, freq="D")})
+         for sid, lo, hi in bounds.itertuples()],
+        ignore_index=True,
+    )
+    panel = grid.merge(raw, on=["series_id", "date"], how="left").rename(columns={"value": "y"})
+    panel["y"] = panel.groupby("series_id", sort=False)["y"].ffill()
+    panel["y"] = panel.groupby("series_id", sort=False)["y"].bfill()
+    return panel
+
+def load_target(args) -> pd.DataFrame:
     tgt = load_csv(args.target, required=True)
     if args.target_col not in tgt.columns:
         # allow single value col named differently
@@ -46,47 +174,119 @@ def main():
         if len(val_cols) != 1:
             raise ValueError(f"Target col {args.target_col} not found and can't infer single value column.")
         tgt = tgt.rename(columns={val_cols[0]: args.target_col})
+    return tgt[["date", args.target_col]]
+
+def build_single(args) -> None:
+    tgt = load_target(args)
 
-    df = backfill_daily(tgt[["date", args.target_col]])
+    df = backfill_daily(tgt)
     df = df.rename(columns={args.target_col: "y"})
 
-    # Optional merges
-    for name in ["ais_daily.csv","outages.csv","weather_us.csv","lng_exports.csv"]:
-        other = load_csv(name, required=False)
-        if other is not None:
-            df = df.merge(other, on="date", how="left")
+    cov = build_covariates(pd.DatetimeIndex(df["date"]), try_json_load(args.sources))
+    df = df.merge(cov, on="date", how="left")
+    out = add_target_features(df, args.horizons)
 
-    # Fill numeric gaps
-    num = df.select_dtypes("number").columns
-    df[num] = df[num].ffill().bfill().fillna(0.0)
+    save_csv(out, config.DATA_DIR / "features_lng.csv")
+    print(f"[OK] wrote {config.DATA_DIR/'features_lng.csv'} rows={len(out)}")
 
-    # Feature engineering
-    df["dow"] = df["date"].dt.dayofweek
-    df["month"] = df["date"].dt.month
-    df["is_wknd"] = (df["dow"]>=5).astype(int)
+def build_panel(args) -> None:
+    panel = load_panel(args.panel)
+    dates = pd.date_range(panel["date"].min(), panel["date"].max(), freq="D")
+    cov = build_covariates(dates, try_json_load(args.sources))
 
-    for lag in [1,2,7,14]:
-        df[f"y_lag{lag}"] = df["y"].shift(lag)
-    df["y_ma7"] = df["y"].rolling(7, min_periods=1).mean()
-    df["y_ma30"] = df["y"].rolling(30, min_periods=1).mean()
+    df = panel.merge(cov, on="date", how="left")
+    df = df.sort_values(["series_id", "date"]).reset_index(drop=True)
+    # stable integer id for pooled models (sorted series ids -> 0..N-1)
+    df.insert(2, "series_code", pd.Categorical(df["series_id"]).codes.astype(np.int32))
+    out = add_target_features(df, args.horizons, by="series_id")
 
-    # If AIS exists, add rolling sums
-    if "departures" in df.columns:
-        df["dep_7d"] = df["departures"].rolling(7, min_periods=1).sum()
-        df["dep_14d"] = df["departures"].rolling(14, min_periods=1).sum()
+    save_csv(out, config.DATA_DIR / PANEL_FEATURES)
+    print(f"[OK] wrote {config.DATA_DIR/PANEL_FEATURES} rows={len(out)} series={out['series_id'].nunique()}")
 
-    # Targets
-    for H in args.horizons:
-        df[f"target_t+{H}"] = df["y"].shift(-H)
+def intraday_target_features(y: pd.Series, spec: FreqSpec, horizons) -> dict:
+    """y lags / rolling means / forward targets on the full grid as float32 arrays (one column each)."""
+    out = {}
+    for lag in spec.lags:
+        out[f"y_lag{lag}"] = y.shift(lag)
+    for w in spec.windows:
+        out[f"y_ma{w}"] = y.rolling(w, min_periods=1).mean()
+    for H in horizons:
+        out[f"target_t+{H}"] = y.shift(-H)
+    return {k: v.to_numpy(dtype=np.float32) for k, v in out.items()}
 
-    # Keep rows where targets exist
-    keep = df["y"].notna()
-    for H in args.horizons:
-        keep &= df[f"target_t+{H}"].notna()
-    out = df.loc[keep].reset_index(drop=True)
+def build_intraday(args) -> None:
+    """Features on an hourly / 15-minute grid, written chunk by chunk.
+
+    Only 1-D arrays (y and its lags/windows/targets) are held for the whole history; the wide
+    frame (covariates + calendar + y features) exists for one chunk of rows at a time.
+    """
+    t0 = time.perf_counter()
+    spec = FREQS[args.freq]
+    horizons = args.horizons or list(spec.horizons)
+
+    tgt = load_target(args)
+    y = tgt.set_index("date")[args.target_col].astype(float).resample(spec.alias).mean()
+    y = y.ffill().bfill()
+    grid = y.index
+
+    # daily covariates (with their publication lags) carried onto every step of their day
+    days = pd.date_range(grid[0].normalize(), grid[-1].normalize(), freq="D")
+    cov = build_covariates(days, try_json_load(args.sources))
+    cov_src = [(Source("covariates", freq="D", lag_days=0), cov)]
+
+    yv = y.to_numpy(dtype=np.float32)
+    yf = intraday_target_features(y, spec, horizons)
+    # same row filter as add_target_features: every horizon has a target (i.e. drop the tail)
+    n = len(grid) - max(horizons)
+
+    out_path = features_path(args.freq)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.unlink(missing_ok=True)
+    for lo in range(0, n, args.chunk_rows):
+        hi = min(lo + args.chunk_rows, n)
+        g = grid[lo:hi]
+        part = asof_join(g, cov_src)
+        part.insert(1, "y", yv[lo:hi])
+        pos = part.columns.get_loc("is_wknd") + 1
+        part.insert(pos, "hour", g.hour)
+        if spec.per_day > 24:
+            part.insert(pos + 1, "minute", g.minute)
+        for c, v in yf.items():
+            part[c] = v[lo:hi]
+        num = part.select_dtypes("number").columns
+        part[num] = part[num].astype(np.float32)
+        part.to_csv(out_path, mode="a", header=lo == 0, index=False, float_format="%.6g")
+
+    rss = peak_rss_mb()
+    print(f"[OK] wrote {out_path} rows={max(n, 0)} freq={args.freq} "
+          f"({time.perf_counter() - t0:.1f}s" + (f", peak RSS {rss:.0f} MB)" if rss else ")"))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--target", default="lng_feedgas.csv", help="Target series CSV in data/external/")
+    ap.add_argument("--target_col", default="feedgas_bcf_d")
+    ap.add_argument("--panel", default=None,
+                    help="Long-format CSV in data/external/ with columns date, series_id, value. "
+                         "Builds data/features_lng_panel.csv instead of the single-series table.")
+    ap.add_argument("--horizons", nargs="+", type=int, default=None,
+                    help="Forecast horizons in grid steps (default: 7 30 daily, FREQS[...].horizons intraday).")
+    ap.add_argument("--sources", default="",
+                    help='JSON (or @file.json) overrides per covariate file: {name: {freq, date_is, lag_days}}')
+    ap.add_argument("--freq", default="D", choices=["D"] + list(FREQS),
+                    help="Grid of the target series. H / 15min write data/features_lng_{hourly|15min}.csv.")
+    ap.add_argument("--chunk_rows", type=int, default=200_000, help="Intraday: rows built and written per chunk.")
+    args = ap.parse_args()
 
-    save_csv(out, DATA_DIR / "features_lng.csv")
-    print(f"[OK] wrote {DATA_DIR/'features_lng.csv'} rows={len(out)}")
+    if args.freq != "D":
+        if args.panel:
+            ap.error("--panel is daily only")
+        build_intraday(args)
+        return
+    args.horizons = args.horizons or [7, 30]
+    if args.panel:
+        build_panel(args)
+    else:
+        build_single(args)
 
 if __name__ == "__main__":
     main()
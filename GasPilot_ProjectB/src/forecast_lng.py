@@ -0,0 +1,68 @@
+"""Forecast with a saved LNG flow model (no retraining).
+
+Reads:
+  data/features_lng.csv
+  models/{model}_h{H}_lng_{timestamp}.joblib  (latest by timestamp, or --model_path)
+Writes:
+  reports/forecast_h{H}_{model}.csv    (date_input, target_date, y_hat)
+
+Intraday (--freq H|15min): data/features_lng_{tag}.csv, models/{model}_h{H}_lng_{tag}_*.joblib,
+reports/{tag}/forecast_h{H}_{model}.csv, H in grid steps.
+
+Example (PowerShell):
+  python -m src.forecast_lng --model hgb --horizons 7 30 --rows 30
+  python -m src.forecast_lng --freq H --model hgb --horizons 24 --rows 48
+"""
+import argparse
+import pandas as pd
+from src import config
+from src.features_lng import FREQS
+from src.train_lng import forecast_last, forecast_intraday, load_intraday
+
+def latest_model(model: str, H: int, tag: str = ""):
+    # single-series models only: the timestamp starts with the year, panel/per-series names do not
+    prefix = f"{model}_h{H}_lng_" + (f"{tag}_" if tag else "")
+    paths = sorted(config.MODELS_DIR.glob(f"{prefix}[0-9]*.joblib"))
+    if not paths:
+        raise FileNotFoundError(f"No saved model {prefix}*.joblib in {config.MODELS_DIR}; run src.train_lng first.")
+    return paths[-1]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="hgb", choices=["hgb","rf","ridge"])
+    ap.add_argument("--horizons", nargs="+", type=int, default=None,
+                    help="Default: 7 30 daily, FREQS[...].horizons intraday (in grid steps).")
+    ap.add_argument("--model_path", default=None, help="Explicit joblib path (only with a single horizon).")
+    ap.add_argument("--rows", type=int, default=30, help="Forecast the last N feature rows.")
+    ap.add_argument("--freq", default="D", choices=["D"] + list(FREQS))
+    args = ap.parse_args()
+    args.horizons = args.horizons or ([7, 30] if args.freq == "D" else list(FREQS[args.freq].horizons))
+    if args.model_path and len(args.horizons) != 1:
+        ap.error("--model_path needs exactly one --horizons value")
+    import joblib
+
+    if args.freq != "D":
+        spec = FREQS[args.freq]
+        X, _, dates = load_intraday(args.freq)
+        out_dir = config.REPORTS_DIR / spec.tag
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for H in args.horizons:
+            mpath = args.model_path or latest_model(args.model, H, spec.tag)
+            out = forecast_intraday(joblib.load(mpath), X, dates, H, spec.delta, args.rows)
+            fpath = out_dir / f"forecast_h{H}_{args.model}.csv"
+            out.to_csv(fpath, index=False)
+            print(f"[OK] wrote {fpath} rows={len(out)} model={mpath}")
+        return
+
+    df = pd.read_csv(config.DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+
+    for H in args.horizons:
+        mpath = args.model_path or latest_model(args.model, H)
+        model = joblib.load(mpath)
+        out = forecast_last(model, df, H, args.rows)
+        fpath = config.REPORTS_DIR / f"forecast_h{H}_{args.model}.csv"
+        out.to_csv(fpath, index=False)
+        print(f"[OK] wrote {fpath} rows={len(out)} model={mpath}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Terminal geofences for AIS position pings.
+
+Registry:
+  TERMINALS holds approximate boxes around the berths of the main U.S. LNG export terminals
+  (lon, lat vertices). They are coarse placeholders; pass surveyed polygons with
+  load_terminals(path), either
+    - CSV with columns terminal, lon, lat (vertices in ring order, one ring per terminal), or
+    - GeoJSON FeatureCollection of Polygon / MultiPolygon features with a `name` property.
+
+Classification (GeofenceIndex.classify) is vectorised over a batch of pings:
+  1. pings outside the padded bounding box of all terminals are rejected by one box test
+  2. the rest are bucketed into a uniform lon/lat grid; each cell lists the terminals whose
+     bounding box touches it (usually zero or one)
+  3. even-odd ray casting against the candidate terminal's rings, one vector op per edge
+Result: terminal code per ping (index into index.names, -1 = outside every terminal).
+
+Events:
+  compress_states keeps only the pings where a vessel's state changes (plus the first/last
+  ping of each run), so hundreds of millions of pings shrink to a few rows per port call.
+  visits() turns those into port calls (enter, exit) per vessel and terminal; arrivals are
+  outside -> inside transitions, departures inside -> outside.
+"""
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+def _box(lon: float, lat: float, dlon: float = 0.03, dlat: float = 0.02) -> list:
+    return [(lon - dlon, lat - dlat), (lon + dlon, lat - dlat), (lon + dlon, lat + dlat), (lon - dlon, lat + dlat)]
+
+TERMINALS = {
+    "sabine_pass": [_box(-93.870, 29.745)],
+    "cameron": [_box(-93.330, 30.035)],
+    "calcasieu_pass": [_box(-93.335, 29.775)],
+    "freeport": [_box(-95.310, 28.940)],
+    "corpus_christi": [_box(-97.265, 27.885)],
+    "cove_point": [_box(-76.385, 38.405)],
+    "elba_island": [_box(-81.020, 32.090)],
+}
+
+def load_terminals(path: str | Path) -> dict:
+    """{terminal: [ring, ...]} from a CSV vertex list or a GeoJSON FeatureCollection."""
+    path = Path(path)
+    if path.suffix.lower() in (".json", ".geojson"):
+        with open(path, "r", encoding="utf-8") as f:
+            fc = json.load(f)
+        out = {}
+        for feat in fc.get("features", []):
+            name = str(feat.get("properties", {}).get("name", "")).strip()
+            geom = feat.get("geometry") or {}
+            polys = [geom["coordinates"]] if geom.get("type") == "Polygon" else geom.get("coordinates", [])
+            if not name or geom.get("type") not in ("Polygon", "MultiPolygon"):
+                raise ValueError(f"{path}: each feature needs a name and a Polygon/MultiPolygon geometry")
+            # every ring (outer and holes) goes into the even-odd test
+            out.setdefault(name, []).extend([[tuple(pt[:2]) for pt in ring] for poly in polys for ring in poly])
+        return out
+    df = pd.read_csv(path)
+    need = {"terminal", "lon", "lat"}
+    if not need.issubset(df.columns):
+        raise ValueError(f"{path}: expected columns {sorted(need)}; got {list(df.columns)}")
+    return {str(t): [list(zip(g["lon"], g["lat"]))] for t, g in df.groupby("terminal", sort=False)}
+
+class GeofenceIndex:
+    """Uniform-grid index over terminal polygons for batch point-in-polygon tests."""
+
+    def __init__(self, terminals: dict, cell_deg: float = 0.01):
+        self.names = list(terminals)
+        self.rings = [[np.asarray(r, dtype=float) for r in terminals[n]] for n in self.names]
+        bb = np.array([[min(r[:, 0].min() for r in rs), min(r[:, 1].min() for r in rs),
+                        max(r[:, 0].max() for r in rs), max(r[:, 1].max() for r in rs)] for rs in self.rings])
+        self.cell = cell_deg
+        self.x0, self.y0 = bb[:, 0].min() - cell_deg, bb[:, 1].min() - cell_deg
+        self.x1, self.y1 = bb[:, 2].max() + cell_deg, bb[:, 3].max() + cell_deg
+        nx = int(np.ceil((self.x1 - self.x0) / cell_deg)) + 1
+        ny = int(np.ceil((self.y1 - self.y0) / cell_deg)) + 1
+
+        # cell -> candidate terminals, padded to the max number of overlapping bounding boxes
+        cand = [[[] for _ in range(nx)] for _ in range(ny)]
+        for t, (xa, ya, xb, yb) in enumerate(bb):
+            ia, ib = self._col(xa), self._col(xb)
+            ja, jb = self._row(ya), self._row(yb)
+            for j in range(ja, jb + 1):
+                for i in range(ia, ib + 1):
+                    cand[j][i].append(t)
+        depth = max((len(c) for row in cand for c in row), default=0)
+        self.grid = np.full((ny, nx, max(depth, 1)), -1, dtype=np.int32)
+        for j in range(ny):
+            for i in range(nx):
+                self.grid[j, i, :len(cand[j][i])] = cand[j][i]
+
+    def _col(self, x):
+        return np.floor((np.asarray(x) - self.x0) / self.cell).astype(np.int64)
+
+    def _row(self, y):
+        return np.floor((np.asarray(y) - self.y0) / self.cell).astype(np.int64)
+
+    def contains(self, t: int, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Even-odd ray casting of points against all rings of terminal t."""
+        inside = np.zeros(len(lon), dtype=bool)
+        for ring in self.rings[t]:
+            xs, ys = ring[:, 0], ring[:, 1]
+            xe, ye = np.roll(xs, -1), np.roll(ys, -1)
+            for x1, y1, x2, y2 in zip(xs, ys, xe, ye):
+                if y1 == y2:
+                    continue
+                cross = (y1 > lat) != (y2 > lat)
+                xint = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+                inside ^= cross & (lon < xint)
+        return inside
+
+    def classify(self, lon, lat) -> np.ndarray:
+        """Terminal code per ping (-1 outside every terminal or missing position)."""
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        out = np.full(len(lon), -1, dtype=np.int32)
+        near = np.flatnonzero((lon >= self.x0) & (lon <= self.x1) & (lat >= self.y0) & (lat <= self.y1))
+        if len(near) == 0:
+            return out
+        px, py = lon[near], lat[near]
+        cand = self.grid[self._row(py), self._col(px)]       # n_near x depth
+        for k in range(cand.shape[1]):
+            todo = (cand[:, k] >= 0) & (out[near] < 0)
+            for t in np.unique(cand[todo, k]):
+                sel = np.flatnonzero(todo & (cand[:, k] == t))
+                hit = sel[self.contains(t, px[sel], py[sel])]
+                out[near[hit]] = t
+        return out
+
+def scan_file(path: str, index: GeofenceIndex, time_col: str, vessel_col: str, lat_col: str, lon_col: str,
+              chunk_rows: int = 1_000_000, time_format: str | None = None) -> pd.DataFrame:
+    """Classify one AIS CSV chunk by chunk; returns its compressed (vessel, time, state) rows."""
+    parts = []
+    for ch in pd.read_csv(path, usecols=[time_col, vessel_col, lat_col, lon_col], chunksize=chunk_rows):
+        t = pd.to_datetime(ch[time_col], format=time_format, errors="coerce", utc=True).dt.tz_localize(None)
+        df = pd.DataFrame({"vessel": ch[vessel_col].to_numpy(), "time": t.to_numpy(),
+                           "state": index.classify(ch[lon_col].to_numpy(), ch[lat_col].to_numpy())})
+        df = df.dropna(subset=["vessel", "time"])
+        parts.append(compress_states(df))
+    if not parts:
+        return pd.DataFrame(columns=["vessel", "time", "state"])
+    return compress_states(pd.concat(parts, ignore_index=True))
+
+def compress_states(df: pd.DataFrame, vessel_col: str = "vessel", time_col: str = "time",
+                    state_col: str = "state") -> pd.DataFrame:
+    """Keep the first and last ping of every run of equal state per vessel.
+
+    Interior pings of a run carry no transition information. Keeping both run ends (not only
+    the first) lets compressed batches be concatenated and compressed again with the same
+    result, as long as each vessel's batches cover consecutive time ranges (e.g. daily files).
+    """
+    if df.empty:
+        return df
+    df = df.sort_values([vessel_col, time_col], kind="stable")
+    v = df[vessel_col].to_numpy()
+    s = df[state_col].to_numpy()
+    new_run = np.ones(len(df), dtype=bool)
+    new_run[1:] = (v[1:] != v[:-1]) | (s[1:] != s[:-1])
+    end_run = np.ones(len(df), dtype=bool)
+    end_run[:-1] = new_run[1:]
+    return df.loc[new_run | end_run]
+
+def _no_calls() -> pd.DataFrame:
+    nat = pd.Series([], dtype="datetime64[ns]")
+    return pd.DataFrame({"vessel": pd.Series([], dtype=object), "terminal": pd.Series([], dtype=object),
+                         "enter": nat, "exit": nat, "first_seen": nat, "last_seen": nat})
+
+def visits(df: pd.DataFrame, names: list, min_dwell_hours: float = 1.0, merge_gap_hours: float = 6.0,
+           vessel_col: str = "vessel", time_col: str = "time", state_col: str = "state") -> pd.DataFrame:
+    """Port calls per vessel and terminal from classified pings (or their compressed state changes).
+
+    Columns: vessel, terminal, enter, exit, first_seen, last_seen.
+      enter      first ping inside; NaT if the vessel is first seen inside (already at berth)
+      exit       first ping outside afterwards; NaT if still inside at the end of the data
+      first_seen / last_seen  first / last ping inside
+    Calls at the same terminal separated by less than merge_gap_hours (GPS jitter at the fence)
+    are merged; calls shorter than min_dwell_hours (transits) are dropped.
+    """
+    cols = ["vessel", "terminal", "enter", "exit", "first_seen", "last_seen"]
+    df = compress_states(df, vessel_col, time_col, state_col)
+    if df.empty:
+        return _no_calls()
+    v = df[vessel_col].to_numpy()
+    t = df[time_col].to_numpy()
+    s = df[state_col].to_numpy()
+    n = len(df)
+    first = np.ones(n, dtype=bool)
+    first[1:] = v[1:] != v[:-1]
+    new_run = first.copy()
+    new_run[1:] |= s[1:] != s[:-1]
+
+    run_start = np.flatnonzero(new_run)
+    run_end = np.append(run_start[1:], n)        # first row of the next run
+    inside = s[run_start] >= 0
+    i, j = run_start[inside], run_end[inside]
+    jj = np.minimum(j, n - 1)
+    has_exit = (j < n) & ~first[jj]              # next run is the same vessel, outside
+    nat = np.datetime64("NaT", "ns")
+    calls = pd.DataFrame({
+        "vessel": v[i],
+        "terminal": s[i],
+        "enter": np.where(first[i], nat, t[i]),
+        "exit": np.where(has_exit, t[jj], nat),
+        "first_seen": t[i],
+        "last_seen": t[j - 1],
+    })
+    if calls.empty:
+        return _no_calls()
+
+    # merge calls of the same vessel/terminal split by short excursions outside the fence
+    calls = calls.sort_values(["vessel", "terminal", "first_seen"], kind="stable").reset_index(drop=True)
+    prev_exit = calls.groupby(["vessel", "terminal"], sort=False)["exit"].shift()
+    gap = calls["first_seen"] - prev_exit
+    grp = (~(gap < pd.Timedelta(hours=merge_gap_hours))).cumsum().to_numpy()
+    # groups are contiguous runs of rows: take their first/last rows literally (groupby
+    # first/last would skip NaT, turning "still in port" into the excursion's exit time)
+    head = np.flatnonzero(np.r_[True, grp[1:] != grp[:-1]])
+    tail = np.append(head[1:], len(grp)) - 1
+    last = calls.iloc[tail]
+    calls = calls.iloc[head].reset_index(drop=True)
+    calls["exit"] = last["exit"].to_numpy()
+    calls["last_seen"] = last["last_seen"].to_numpy()
+    dwell = calls["exit"].fillna(calls["last_seen"]) - calls["first_seen"]
+    calls = calls.loc[(dwell >= pd.Timedelta(hours=min_dwell_hours)) | calls["exit"].isna()]
+    calls["terminal"] = np.asarray(names, dtype=object)[calls["terminal"].to_numpy()]
+    return calls[cols].reset_index(drop=True)
+
+def _daily(frame: pd.DataFrame, value: str | None, suffix: str) -> pd.DataFrame:
+    if frame.empty:
+        return pd.DataFrame()
+    g = frame.groupby(["date", "terminal"])
+    counts = g.size() if value is None else g[value].nunique()
+    return counts.unstack("terminal").add_suffix(suffix)
+
+COUNT_KINDS = ("arrivals", "departures", "vessels")
+
+def daily_terminal_counts(calls: pd.DataFrame, names: list, dates: pd.DatetimeIndex | None = None) -> pd.DataFrame:
+    """Wide daily table: {terminal}_arrivals, {terminal}_departures, {terminal}_vessels (distinct in port).
+
+    Every terminal in `names` (the registry, e.g. GeofenceIndex.names) gets its three columns,
+    zero-filled when it had no calls, so the schema does not depend on the input data.
+    """
+    arr = calls.dropna(subset=["enter"]).assign(date=lambda d: d["enter"].dt.floor("D"))
+    dep = calls.dropna(subset=["exit"]).assign(date=lambda d: d["exit"].dt.floor("D"))
+
+    # days in port: one row per call and calendar day from first ping inside to exit (or last ping inside)
+    lo = calls["first_seen"].dt.floor("D").to_numpy()
+    hi = calls["exit"].fillna(calls["last_seen"]).dt.floor("D").to_numpy()
+    ndays = ((hi - lo) // np.timedelta64(1, "D")).astype(np.int64) + 1
+    offset = np.arange(ndays.sum()) - np.repeat(np.cumsum(ndays) - ndays, ndays)
+    stay = pd.DataFrame({
+        "date": np.repeat(lo, ndays) + offset.astype("timedelta64[D]"),
+        "terminal": np.repeat(calls["terminal"].to_numpy(), ndays),
+        "vessel": np.repeat(calls["vessel"].to_numpy(), ndays),
+    })
+
+    out = pd.concat([_daily(arr, None, "_arrivals"), _daily(dep, None, "_departures"),
+                     _daily(stay, "vessel", "_vessels")], axis=1)
+    if dates is not None:
+        out = out.reindex(out.index.union(pd.DatetimeIndex(dates)))
+    out = out.reindex(columns=[f"{t}_{k}" for t in names for k in COUNT_KINDS])
+    out = out.fillna(0).astype(int)
+    return out.rename_axis("date").reset_index()
@@ -0,0 +1,211 @@
+"""Accuracy leaderboard over all backtest and forecast reports.
+
+Scans a reports directory once for
+  backtest_h{H}_{model}[-{mode}_{series_id}].csv   (date_input, target_date, y_true, y_hat)
+  forecast_h{H}_{model}[-{mode}_{series_id}].csv   (date_input, target_date, y_hat; truth joined from actuals)
+and computes MAE / RMSE / MAPE / bias / hit-rate per model x horizon x slice. Panel reports carry
+the panel mode in the model name (hgb-global, hgb-per_series), so both modes rank side by side.
+
+Slices (group, value):
+  all      all
+  month    1..12 of target_date
+  season   winter (Nov-Mar) / summer (Apr-Oct) of target_date
+  vol      high / normal: 30-day std of daily changes of the actual series at date_input,
+           above / below its 75th percentile
+  month_vol   month x vol, e.g. 1_high
+  season_vol  season x vol, e.g. winter_normal
+Hit-rate: share of rows where sign(y_hat - y_ref) == sign(y_true - y_ref), y_ref = actual at date_input.
+
+Actuals come from data/features_lng.csv (date, y) and data/features_lng_panel.csv (date, series_id, y);
+with --freq H|15min from data/features_lng_{hourly|15min}.csv, scoring reports/{hourly|15min}/
+(the volatility window is then 30 days of grid steps).
+
+Performance:
+  - files are read in a thread pool with only the needed columns
+  - each file is reduced to partial sums over (month, vol regime) bins with np.bincount
+  - partial sums are cached in {reports_dir}/.metrics_cache.csv keyed by file size/mtime and
+    the actuals files' mtimes, so reruns only read new or changed reports
+
+Writes: reports/leaderboard.csv
+  (kind, horizon, model, series_id, group, value, n, mae, rmse, mape, bias, hit_rate)
+
+Example (PowerShell):
+  python -m src.report_metrics
+  python -m src.report_metrics --reports_dir reports --out reports/leaderboard.csv
+"""
+import argparse
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src import config
+from src.features_lng import FREQS, PANEL_FEATURES, features_path
+
+REPORT_RE = re.compile(r"^(backtest|forecast)_h(\d+)_([a-z]+(?:-global|-per_series)?)(?:_(.+))?\.csv$")
+CACHE_NAME = ".metrics_cache.csv"
+SUMS = ["n", "se", "sae", "sse", "sape", "nape", "hit", "nhit"]
+N_BINS = 12 * 2  # (month - 1) * 2 + high_vol
+WINTER = {11, 12, 1, 2, 3}
+
+def actuals_paths(freq: str = "D") -> list:
+    if freq != "D":
+        return [features_path(freq)]
+    return [features_path(), config.DATA_DIR / PANEL_FEATURES]
+
+def actuals_signature(freq: str = "D") -> str:
+    return ";".join(f"{p.name}:{p.stat().st_mtime_ns}" for p in actuals_paths(freq) if p.exists())
+
+def load_actuals(freq: str = "D") -> dict:
+    """{series_id or "": DataFrame(index=date, columns=[y, high_vol])}."""
+    out = {}
+    single, panel = (actuals_paths(freq) + [None])[:2]
+    window = 30 * (FREQS[freq].per_day if freq != "D" else 1)
+    frames = []
+    if single.exists():
+        frames.append(pd.read_csv(single, usecols=["date", "y"], parse_dates=["date"]).assign(series_id=""))
+    if panel is not None and panel.exists():
+        frames.append(pd.read_csv(panel, usecols=["date", "series_id", "y"], parse_dates=["date"],
+                                  dtype={"series_id": str}))
+    for f in frames:
+        for sid, g in f.groupby("series_id", sort=False):
+            s = g.drop_duplicates("date").set_index("date")["y"].sort_index()
+            vol = s.diff().rolling(window, min_periods=10).std()
+            out[sid] = pd.DataFrame({"y": s, "high_vol": (vol > vol.quantile(0.75)).astype(np.int8)})
+    return out
+
+def parse_name(path: Path):
+    m = REPORT_RE.match(path.name)
+    if not m:
+        return None
+    kind, h, model, series = m.groups()
+    return {"kind": kind, "horizon": int(h), "model": model, "series_id": series or ""}
+
+def reduce_file(path: Path, meta: dict, actuals: dict) -> np.ndarray:
+    """Per-bin partial sums (N_BINS x len(SUMS)) for one report file."""
+    cols = ["date_input", "target_date", "y_hat"] + (["y_true"] if meta["kind"] == "backtest" else [])
+    df = pd.read_csv(path, usecols=cols, parse_dates=["date_input", "target_date"])
+    act = actuals.get(meta["series_id"])
+    if act is not None:
+        ref = act.reindex(df["date_input"])
+        y_ref = ref["y"].to_numpy(dtype=float)
+        high = ref["high_vol"].fillna(0).to_numpy(dtype=np.int64)
+        if meta["kind"] == "forecast":
+            df["y_true"] = act["y"].reindex(df["target_date"]).to_numpy()
+    else:
+        y_ref = np.full(len(df), np.nan)
+        high = np.zeros(len(df), dtype=np.int64)
+
+    y = df["y_true"].to_numpy(dtype=float)
+    yh = df["y_hat"].to_numpy(dtype=float)
+    ok = ~(np.isnan(y) | np.isnan(yh))
+    e = np.where(ok, yh - y, 0.0)
+    ape_ok = ok & (y != 0)
+    ape = np.where(ape_ok, np.abs(e) / np.where(y == 0, 1.0, np.abs(y)), 0.0)
+    hit_ok = ok & ~np.isnan(y_ref)
+    hit = hit_ok & (np.sign(yh - y_ref) == np.sign(y - y_ref))
+
+    key = (df["target_date"].dt.month.to_numpy() - 1) * 2 + high
+    w = [ok, e, np.abs(e), e ** 2, ape, ape_ok, hit, hit_ok]
+    return np.stack([np.bincount(key, weights=np.asarray(v, dtype=float), minlength=N_BINS) for v in w], axis=1)
+
+CACHE_COLS = ["file", "size", "mtime_ns", "sig", "bin"] + SUMS
+
+def load_cache(path: Path) -> pd.DataFrame:
+    if path.exists():
+        return pd.read_csv(path, dtype={"file": str, "sig": str}, keep_default_na=False)
+    return pd.DataFrame(columns=CACHE_COLS)
+
+def collect(reports_dir: Path, workers: int | None = None, freq: str = "D") -> pd.DataFrame:
+    """Partial sums for every report in reports_dir, reusing the cache for unchanged files."""
+    files = {p.name: (p, meta) for p in sorted(reports_dir.glob("*.csv")) if (meta := parse_name(p))}
+    sig = actuals_signature(freq)
+    cache_path = reports_dir / CACHE_NAME
+    cache = load_cache(cache_path)
+
+    fresh, todo = [], []
+    cached = {f: g for f, g in cache.groupby("file", sort=False)}
+    for name, (p, meta) in files.items():
+        st = p.stat()
+        g = cached.get(name)
+        if g is not None and int(g["size"].iloc[0]) == st.st_size \
+                and int(g["mtime_ns"].iloc[0]) == st.st_mtime_ns and g["sig"].iloc[0] == sig:
+            fresh.append(g)
+        else:
+            todo.append((name, p, meta, st))
+    print(f"[INFO] {len(files)} reports, {len(files) - len(todo)} cached, {len(todo)} to read")
+
+    if todo:
+        actuals = load_actuals(freq)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            sums = list(pool.map(lambda t: reduce_file(t[1], t[2], actuals), todo))
+        for (name, p, meta, st), arr in zip(todo, sums):
+            part = pd.DataFrame(arr, columns=SUMS)
+            part.insert(0, "bin", np.arange(N_BINS))
+            part = part[part["n"] > 0]
+            # keep a marker row for files without any scorable rows so they stay cached
+            if part.empty:
+                part = pd.DataFrame([[-1] + [0.0] * len(SUMS)], columns=["bin"] + SUMS)
+            fresh.append(part.assign(file=name, size=st.st_size, mtime_ns=st.st_mtime_ns, sig=sig))
+
+    allp = pd.concat(fresh, ignore_index=True)[CACHE_COLS] if fresh else pd.DataFrame(columns=CACHE_COLS)
+    allp.to_csv(cache_path, index=False)
+
+    allp = allp[allp["bin"] >= 0].copy()
+    meta = pd.DataFrame([{"file": n, **m} for n, (_, m) in files.items()])
+    if meta.empty or allp.empty:
+        return pd.DataFrame()
+    return allp.merge(meta, on="file", how="inner")
+
+def leaderboard(parts: pd.DataFrame) -> pd.DataFrame:
+    ids = ["kind", "horizon", "model", "series_id"]
+    b = parts["bin"].to_numpy().astype(int)
+    month = b // 2 + 1
+    parts = parts.assign(
+        all="all",
+        month=month.astype(str),
+        season=np.where(np.isin(month, list(WINTER)), "winter", "summer"),
+        vol=np.where(b % 2 == 1, "high", "normal"),
+    )
+    parts["month_vol"] = parts["month"] + "_" + parts["vol"]
+    parts["season_vol"] = parts["season"] + "_" + parts["vol"]
+    rows = []
+    for group in ["all", "month", "season", "vol", "month_vol", "season_vol"]:
+        g = parts.groupby(ids + [group], sort=False)[SUMS].sum().reset_index().rename(columns={group: "value"})
+        rows.append(g.assign(group=group))
+    lb = pd.concat(rows, ignore_index=True)
+    n = lb["n"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lb["mae"] = lb["sae"] / n
+        lb["rmse"] = np.sqrt(lb["sse"] / n)
+        lb["mape"] = lb["sape"] / lb["nape"] * 100.0
+        lb["bias"] = lb["se"] / n
+        lb["hit_rate"] = lb["hit"] / lb["nhit"]
+    lb["n"] = lb["n"].astype(int)
+    lb = lb[ids + ["group", "value", "n", "mae", "rmse", "mape", "bias", "hit_rate"]]
+    return lb.sort_values(["kind", "horizon", "series_id", "group", "value", "mae"]).reset_index(drop=True)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reports_dir", default=None, help="Default: reports/ (reports/{tag}/ with --freq)")
+    ap.add_argument("--out", default=None, help="Default: {reports_dir}/leaderboard.csv")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--freq", default="D", choices=["D"] + list(FREQS))
+    args = ap.parse_args()
+
+    if args.reports_dir:
+        reports_dir = Path(args.reports_dir)
+    else:
+        reports_dir = config.REPORTS_DIR if args.freq == "D" else config.REPORTS_DIR / FREQS[args.freq].tag
+    parts = collect(reports_dir, workers=args.workers, freq=args.freq)
+    if parts.empty:
+        print(f"[WARN] no scorable reports in {reports_dir}")
+        return
+    lb = leaderboard(parts)
+    out = Path(args.out) if args.out else reports_dir / "leaderboard.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    lb.to_csv(out, index=False)
+    print(f"[OK] wrote {out} rows={len(lb)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,123 @@
 """Scenario shocks for LNG flow model outputs.
 
-Applies additive/multiplicative shocks to selected feature columns and re-predicts.
+Applies additive shocks to selected feature columns and re-predicts.
+
+Shocks on raw inputs propagate to the features derived from them in src/features_lng.py
+(e.g. `departures` -> `dep_7d`, `dep_14d`; `y` -> `y_lag*`, `y_ma*`), so a scenario stays
+internally consistent. Only the affected columns over the shocked row window are updated,
+using incremental lag/rolling deltas instead of rebuilding the feature table.
+
+Shock values:
+  - number: constant added to each of the last N rows
+  - list:   path shock, element i is added to row i of the window (shorter lists are zero-padded)
 
 Example (PowerShell):
   python -m src.scenario_lng --model_path models/hgb_h7_lng_*.joblib --horizon 7 --shocks '{"hdd": 5, "outage_flag": 1}'
+  python -m src.scenario_lng --model_path models/hgb_h7_lng_*.joblib --horizon 7 --shocks '{"departures": [0, 0, 2, 4, 4]}'
+  python -m src.scenario_lng --model_path models/hgb_h7_lng_*.joblib --horizon 7 --batch @scenarios.json
+    (scenarios.json: {"name": {col: shock, ...}, ...}; one CSV with a `scenario` column)
 """
-import argparse, json
+import argparse
+import numpy as np
 import pandas as pd
-import joblib
 from pathlib import Path
-from src.config import DATA_DIR, REPORTS_DIR
-from src.utils import numeric_only, utc_now_tag
+from src import config
+from src.features_lng import derived_features
+from src.utils import numeric_only, utc_now_tag, try_json_load
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--model_path", required=True, help="Path to joblib model (Pipeline).")
-    ap.add_argument("--horizon", type=int, default=7)
-    ap.add_argument("--shocks", required=True, help="JSON dict: {col: shock}. If value is float, adds to column.")
-    ap.add_argument("--rows", type=int, default=60, help="Use last N rows.")
-    args = ap.parse_args()
+def shock_vector(val, n: int) -> np.ndarray:
+    """Constant or path shock as a length-n vector."""
+    if isinstance(val, (list, tuple)):
+        v = np.asarray(val, dtype=float)
+        if len(v) > n:
+            raise ValueError(f"path shock has {len(v)} values but the scenario window has {n} rows")
+        return np.concatenate([v, np.zeros(n - len(v))])
+    return np.full(n, float(val))
+
+def derived_delta(x: pd.Series, d: np.ndarray, p0: int, op: str, w: int) -> np.ndarray:
+    """Change of a derived column over rows p0.. when input `x` gets `d` added on rows p0..
 
-    shocks = json.loads(args.shocks)
-    df = pd.read_csv(DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
-    last = df.tail(args.rows).copy()
+    Rolling windows are updated from prefix sums of the shock (O(window rows)), using the
+    unshocked `x` only to count valid observations for rolling means.
+    """
+    m = len(d)
+    if op == "lag":
+        out = np.zeros(m)
+        if w < m:
+            out[w:] = d[:m - w]
+        return out
+    c = np.concatenate([[0.0], np.cumsum(d)])
+    t = np.arange(m)
+    s = c[t + 1] - c[np.clip(t - w + 1, 0, None)]
+    if op == "sum":
+        return s
+    if op == "mean":
+        lo = max(p0 - w + 1, 0)
+        cnt = x.iloc[lo:].notna().rolling(w, min_periods=1).sum().to_numpy()[-m:]
+        return np.divide(s, cnt, out=np.zeros(m), where=cnt > 0)
+    raise ValueError(f"unknown feature op: {op}")
+
+def apply_scenario(df: pd.DataFrame, shocks: dict, rows: int) -> pd.DataFrame:
+    """Shocked copy of the last `rows` rows of df with derived features kept consistent."""
+    p0 = max(len(df) - rows, 0)
+    last = df.iloc[p0:].copy()
+    m = len(last)
+
+    graph = {}
+    for dcol, src, op, w in derived_features():
+        graph.setdefault(src, []).append((dcol, op, w))
 
     for col, val in shocks.items():
         if col not in last.columns:
             print(f"[WARN] shock col not found: {col}")
             continue
-        last[col] = last[col] + float(val)
+        x = df[col]
+        # missing inputs stay missing (rolling stats skip them), so their shock is dropped
+        d = np.where(x.iloc[p0:].notna().to_numpy(), shock_vector(val, m), 0.0)
+        last[col] = last[col] + d
+        for dcol, op, w in graph.get(col, []):
+            if dcol in last.columns:
+                last[dcol] = last[dcol] + derived_delta(x, d, p0, op, w)
+    return last
 
-    model = joblib.load(args.model_path)
+def predict_scenario(model, last: pd.DataFrame, horizon: int) -> pd.DataFrame:
     Xp = numeric_only(last, drop_cols=("date",) + tuple([c for c in last.columns if c.startswith("target_t+")]))
     yhat = model.predict(Xp)
-
-    out = pd.DataFrame({
-        "date_input": last["date"],
-        "target_date": last["date"] + pd.to_timedelta(args.horizon, unit="D"),
+    return pd.DataFrame({
+        "date_input": last["date"].to_numpy(),
+        "target_date": (last["date"] + pd.to_timedelta(horizon, unit="D")).to_numpy(),
         "y_hat_scn": yhat
     })
 
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model_path", required=True, help="Path to joblib model (Pipeline).")
+    ap.add_argument("--horizon", type=int, default=7)
+    ap.add_argument("--shocks", default=None,
+                    help="JSON dict (or @file.json): {col: shock}. Number = constant add, list = path shock.")
+    ap.add_argument("--batch", default=None, help="JSON (or @file.json) {scenario_name: {col: shock}}.")
+    ap.add_argument("--rows", type=int, default=60, help="Use last N rows.")
+    args = ap.parse_args()
+    if not args.shocks and not args.batch:
+        ap.error("one of --shocks or --batch is required")
+
+    df = pd.read_csv(config.DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+    import joblib
+    model = joblib.load(args.model_path)
+
+    if args.batch:
+        scenarios = try_json_load(args.batch)
+        out = pd.concat(
+            [predict_scenario(model, apply_scenario(df, shocks, args.rows), args.horizon).assign(scenario=name)
+             for name, shocks in scenarios.items()],
+            ignore_index=True,
+        )
+        out = out[["scenario", "date_input", "target_date", "y_hat_scn"]]
+    else:
+        out = predict_scenario(model, apply_scenario(df, try_json_load(args.shocks), args.rows), args.horizon)
+
     tag = utc_now_tag()
-    out_path = REPORTS_DIR / f"scenario_h{args.horizon}_{tag}.csv"
+    out_path = config.REPORTS_DIR / f"scenario_h{args.horizon}_{tag}.csv"
     out.to_csv(out_path, index=False)
     print(f"[OK] wrote {out_path} rows={len(out)}")
 
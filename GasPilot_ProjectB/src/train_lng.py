@@ -1,35 +1,76 @@
 """Train LNG flow forecasting models with walk-forward backtest.
 
-Reads: data/features_lng.csv
+Reads: data/features_lng.csv  (or data/features_lng_panel.csv with --panel)
 Writes:
   models/{model}_h{H}_lng_{timestamp}.joblib
   reports/backtest_h{H}_{model}.csv    (date_input, target_date, y_true, y_hat)
   reports/forecast_h{H}_{model}.csv    (date_input, target_date, y_hat)
 
+Panel mode (--panel) writes one backtest/forecast per series, {mode} = global | per_series:
+  reports/backtest_h{H}_{model}-{mode}_{series_id}.csv   (series_id, date_input, target_date, y_true, y_hat)
+  reports/forecast_h{H}_{model}-{mode}_{series_id}.csv   (series_id, date_input, target_date, y_hat)
+  --panel_mode global      one pooled model per (H, model), series_code used as a categorical feature
+                           (one-hot for rf/ridge, native categorical splits for hgb)
+                           -> models/{model}_h{H}_lng_panel_{timestamp}.joblib
+  --panel_mode per_series  one model per series, fitted in a process pool (--n_jobs)
+                           -> models/{model}_h{H}_lng_{series_id}_{timestamp}.joblib
+
+Intraday mode (--freq H|15min) reads data/features_lng_{hourly|15min}.csv and writes
+  reports/{tag}/backtest_h{H}_{model}.csv, reports/{tag}/forecast_h{H}_{model}.csv
+  models/{model}_h{H}_lng_{tag}_{timestamp}.joblib
+  with H in grid steps; --min_train_days / --step stay in days.
+
 Models:
   - rf: RandomForestRegressor
   - hgb: HistGradientBoostingRegressor (handles NaNs)
   - ridge: linear baseline
+  Intraday uses the large-data variants (make_model(large=True)): hgb without the imputer
+  (native NaN handling, early stopping), rf on 20% bootstrap subsamples with leaf >= 5.
 
 Method:
   - Walk-forward evaluation with expanding window.
+  - Optional point-in-time folds (--vintage_map): mapped columns are replaced per fold by
+    their values as known at the fold date, read from data/vintages.sqlite. Folds that start
+    before a series' first fetch can only use its earliest vintage (not point-in-time); they
+    are counted in a warning and kept, skipped or rejected (--vintage_missing).
   - Final fit on all available data for forecasting.
 """
-import argparse, os
+import argparse, os, time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-import joblib
-from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
-from sklearn.linear_model import Ridge
-from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
-from src.config import DATA_DIR, MODELS_DIR, REPORTS_DIR
-from src.utils import utc_now_tag, numeric_only
-
-def make_model(name: str):
+from src import config
+from src.utils import utc_now_tag, numeric_only, try_json_load, peak_rss_mb
+from src.features_lng import Y_LAGS, Y_WINDOWS, FREQS, features_path
+from src.vintage_store import VintageStore, DEFAULT_DB
+
+PANEL_ID_COLS = ("series_id", "series_code")
+
+def make_model(name: str, n_jobs: int = -1, large: bool = False, categorical=()):
+    """Estimator pipeline; `large` picks settings that scale to millions of float32 rows.
+
+    `categorical` names integer id columns (e.g. series_code) that must not be read as ordinal.
+    """
+    pipe = _make_pipeline(name, n_jobs, large)
+    return with_categorical(pipe, list(categorical)) if categorical else pipe
+
+def _make_pipeline(name: str, n_jobs: int, large: bool):
+    # sklearn is imported on first use so `train_lng --help` (and gaspilot) start fast
+    from sklearn.pipeline import Pipeline
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import Ridge
+    from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+    if large and name == "hgb":
+        # bins features into <= 255 histogram buckets once per fit, NaNs get their own bin
+        return Pipeline([("model", HistGradientBoostingRegressor(max_iter=300, early_stopping=True,
+                                                                 random_state=42))])
+    if large and name == "rf":
+        return Pipeline([("impute", SimpleImputer(strategy="median")),
+                         ("model", RandomForestRegressor(n_estimators=200, max_samples=0.2, min_samples_leaf=5,
+                                                         max_features=0.5, random_state=42, n_jobs=n_jobs))])
     if name == "rf":
         return Pipeline([("impute", SimpleImputer(strategy="median")),
-                         ("model", RandomForestRegressor(n_estimators=500, random_state=42, n_jobs=-1))])
+                         ("model", RandomForestRegressor(n_estimators=500, random_state=42, n_jobs=n_jobs))])
     if name == "ridge":
         return Pipeline([("impute", SimpleImputer(strategy="median")),
                          ("model", Ridge(alpha=1.0))])
@@ -39,28 +80,103 @@ def make_model(name: str):
                          ("model", HistGradientBoostingRegressor(random_state=42))])
     raise ValueError("model must be one of: rf, ridge, hgb")
 
-def walk_forward(df: pd.DataFrame, H: int, model_name: str, min_train_days: int = 365, step: int = 7):
+def with_categorical(pipe, cols: list):
+    """Route `cols` around the imputer: one-hot for rf/ridge, categorical_features for hgb."""
+    from sklearn.pipeline import Pipeline
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    steps = dict(pipe.steps)
+    model = steps["model"]
+    if isinstance(model, HistGradientBoostingRegressor):
+        # codes must be < max_bins (255); ColumnTransformer outputs `cols` first
+        enc = "passthrough"
+        model.set_params(categorical_features=list(range(len(cols))))
+    else:
+        enc = OneHotEncoder(handle_unknown="ignore", sparse_output=False)
+    prep = ColumnTransformer([("categorical", enc, cols)], remainder=steps.get("impute", "passthrough"))
+    return Pipeline([("prep", prep), ("model", model)])
+
+def feature_drop_cols(df: pd.DataFrame, extra=()) -> tuple:
+    """Columns never used as model inputs: date, targets, plus any `extra` id columns."""
+    return ("date",) + tuple(extra) + tuple([c for c in df.columns if c.startswith("target_t+")])
+
+def as_of_features(X: pd.DataFrame, dates: pd.Series, store, vintages: dict, cutoff) -> pd.DataFrame:
+    """Copy of X with vintaged columns replaced by their values as known at `cutoff`.
+
+    `vintages` maps feature column -> series name in the vintage store. If `y` is mapped,
+    its lag/rolling features are recomputed from the as-of values as well.
+    """
+    X = X.copy()
+    vf = store.as_of_frame(vintages, cutoff, pd.DatetimeIndex(dates))
+    for col in vf.columns:
+        X[col] = vf[col].to_numpy()
+    if "y" in vf.columns:
+        y = X["y"]
+        for lag in Y_LAGS:
+            if f"y_lag{lag}" in X.columns:
+                X[f"y_lag{lag}"] = y.shift(lag)
+        for w in Y_WINDOWS:
+            if f"y_ma{w}" in X.columns:
+                X[f"y_ma{w}"] = y.rolling(w, min_periods=1).mean()
+    return X
+
+def backtest_inputs(df: pd.DataFrame, H: int):
+    """Feature matrix, target and dates of the rows with a target for horizon H."""
     target = f"target_t+{H}"
     y = df[target].astype(float)
-    X = numeric_only(df, drop_cols=("date",) + tuple([c for c in df.columns if c.startswith("target_t+")]))
+    X = numeric_only(df, drop_cols=feature_drop_cols(df))
     # align
     keep = y.notna()
     X = X.loc[keep].reset_index(drop=True)
     y = y.loc[keep].reset_index(drop=True)
     dates = df.loc[keep, "date"].reset_index(drop=True)
+    return X, y, dates
+
+def fold_starts(n: int, min_train_days: int = 365, step: int = 7) -> list:
+    """Row index of the first test row of every expanding-window fold."""
+    return list(range(min_train_days, n - 1, step))
+
+def run_fold(model, X: pd.DataFrame, y: pd.Series, dates: pd.Series, i: int, step: int,
+             store=None, vintages: dict | None = None) -> np.ndarray:
+    """Fit on rows [:i] and predict rows [i:i+step] (as-of features when `vintages` is set)."""
+    Xf = X.iloc[:i+step]
+    if vintages:
+        Xf = as_of_features(Xf, dates.iloc[:i+step], store, vintages, cutoff=dates.iloc[i])
+    model.fit(Xf.iloc[:i], y.iloc[:i])
+    return model.predict(Xf.iloc[i:i+step])
+
+def walk_forward(df: pd.DataFrame, H: int, model_name: str, min_train_days: int = 365, step: int = 7,
+                 n_jobs: int = -1, store=None, vintages: dict | None = None, vintage_missing: str = "earliest"):
+    """Expanding-window backtest.
+
+    With `store` + `vintages`, each fold sees the mapped columns as they were known at the
+    fold's first test date (see gaspilot_shared/vintage_store.py) instead of today's revised values.
+    A fold that starts before the first fetch of a mapped series is not point-in-time;
+    `vintage_missing` decides: "earliest" (use the earliest vintage and warn), "skip" or "fail".
+    """
+    X, y, dates = backtest_inputs(df, H)
 
     preds = []
-    model = make_model(model_name)
+    model = make_model(model_name, n_jobs=n_jobs)
+    n_folds, late_folds, late_cols = 0, 0, set()
 
-    n = len(df.loc[keep])
-    for i in range(min_train_days, n - 1, step):
-        X_train, y_train = X.iloc[:i], y.iloc[:i]
-        X_test, y_test = X.iloc[i:i+step], y.iloc[i:i+step]
-        if len(X_test) == 0:
+    for i in fold_starts(len(X), min_train_days, step):
+        y_test = y.iloc[i:i+step]
+        if len(y_test) == 0:
             break
-        model.fit(X_train, y_train)
-        y_hat = model.predict(X_test)
-        for j in range(len(X_test)):
+        n_folds += 1
+        late = store.fallback_columns(vintages, dates.iloc[i]) if vintages else []
+        if late:
+            if vintage_missing == "fail":
+                raise ValueError(f"h{H} {model_name}: fold at {dates.iloc[i].date()} predates the first vintage of "
+                                 f"{late}; no point-in-time values (use --vintage_missing earliest|skip)")
+            late_folds += 1
+            late_cols.update(late)
+            if vintage_missing == "skip":
+                continue
+        y_hat = run_fold(model, X, y, dates, i, step, store=store, vintages=vintages)
+        for j in range(len(y_test)):
             date_input = dates.iloc[i + j]
             preds.append({
                 "date_input": date_input,
@@ -69,19 +185,243 @@ def walk_forward(df: pd.DataFrame, H: int, model_name: str, min_train_days: int
                 "y_hat": float(y_hat[j]),
             })
 
+    if late_folds:
+        firsts = ", ".join(f"{c}: {store.first_asof(vintages[c])}" for c in sorted(late_cols))
+        action = "skipped" if vintage_missing == "skip" else "used the earliest vintage, not point-in-time"
+        print(f"[WARN] h{H} {model_name}: {late_folds} of {n_folds} folds start before the first vintage "
+              f"({firsts}); {action}")
+
     bt = pd.DataFrame(preds)
     return bt
 
+def walk_forward_panel(df: pd.DataFrame, H: int, model_name: str, min_train_days: int = 365, step: int = 7):
+    """Pooled walk-forward over all series: folds are cut on calendar dates, not row counts.
+
+    Fold k trains on every row dated before its cutoff and predicts all series for the
+    next `step` dates, so each fold is one fit regardless of the number of series.
+    """
+    target = f"target_t+{H}"
+    df = df.loc[df[target].notna()].sort_values(["date", "series_id"], kind="stable").reset_index(drop=True)
+    X = numeric_only(df, drop_cols=feature_drop_cols(df, extra=("series_id",)))
+    y = df[target].astype(float).to_numpy()
+    dates = df["date"].to_numpy()
+    udates = np.unique(dates)
+
+    model = make_model(model_name, categorical=("series_code",))
+    parts = []
+    for i in range(min_train_days, len(udates) - 1, step):
+        lo = np.searchsorted(dates, udates[i], side="left")
+        hi = np.searchsorted(dates, udates[min(i + step, len(udates)) - 1], side="right")
+        if hi <= lo:
+            break
+        model.fit(X.iloc[:lo], y[:lo])
+        parts.append((lo, hi, model.predict(X.iloc[lo:hi])))
+
+    if not parts:
+        return pd.DataFrame(columns=["series_id", "date_input", "target_date", "y_true", "y_hat"])
+    idx = np.concatenate([np.arange(lo, hi) for lo, hi, _ in parts])
+    date_input = df["date"].iloc[idx].reset_index(drop=True)
+    return pd.DataFrame({
+        "series_id": df["series_id"].iloc[idx].to_numpy(),
+        "date_input": date_input,
+        "target_date": date_input + pd.to_timedelta(H, unit="D"),
+        "y_true": y[idx],
+        "y_hat": np.concatenate([p for _, _, p in parts]),
+    })
+
+def fit_final(dfH: pd.DataFrame, H: int, model_name: str, extra_drop=(), n_jobs: int = -1, categorical=()):
+    """Final fit on all rows of dfH for forecasting."""
+    X_all = numeric_only(dfH, drop_cols=feature_drop_cols(dfH, extra=extra_drop))
+    y_all = dfH[f"target_t+{H}"].astype(float)
+    model = make_model(model_name, n_jobs=n_jobs, categorical=categorical)
+    model.fit(X_all, y_all)
+    return model
+
+def forecast_last(model, dfH: pd.DataFrame, H: int, forecast_rows: int, extra_drop=()) -> pd.DataFrame:
+    """QA forecast of the last `forecast_rows` rows of dfH."""
+    last = dfH.tail(forecast_rows).reset_index(drop=True)
+    Xp = numeric_only(last, drop_cols=feature_drop_cols(last, extra=extra_drop))
+    yhat = model.predict(Xp)
+    return pd.DataFrame({
+        "date_input": last["date"],
+        "target_date": last["date"] + pd.to_timedelta(H, unit="D"),
+        "y_hat": yhat
+    })
+
+def _run_series(job):
+    """Process-pool worker: backtest + final fit for one series (single-threaded estimators)."""
+    sid, dfS, H, m, min_train_days, step, forecast_rows = job
+    dfS = dfS.drop(columns=list(PANEL_ID_COLS)).reset_index(drop=True)
+    bt = walk_forward(dfS, H, m, min_train_days=min_train_days, step=step, n_jobs=1)
+    model = fit_final(dfS, H, m, n_jobs=1)
+    fc = forecast_last(model, dfS, H, forecast_rows)
+    return sid, bt, model, fc
+
+def _write_series_reports(sid: str, H: int, m: str, mode: str, bt: pd.DataFrame, fc: pd.DataFrame) -> None:
+    for kind, frame in (("backtest", bt), ("forecast", fc)):
+        frame = frame.copy()
+        frame.insert(0, "series_id", sid)
+        path = config.REPORTS_DIR / f"{kind}_h{H}_{m}-{mode}_{sid}.csv"
+        frame.to_csv(path, index=False)
+        print(f"[OK] wrote {path} rows={len(frame)}")
+
+def run_panel(args) -> None:
+    import joblib
+    df = pd.read_csv(config.DATA_DIR/"features_lng_panel.csv", parse_dates=["date"], dtype={"series_id": str})
+    df = df.sort_values(["series_id", "date"]).reset_index(drop=True)
+
+    for H in args.horizons:
+        target = f"target_t+{H}"
+        dfH = df.loc[df[target].notna()].reset_index(drop=True)
+
+        for m in args.models:
+            tag = utc_now_tag()
+            if args.panel_mode == "global":
+                bt = walk_forward_panel(dfH, H, m, min_train_days=args.min_train_days, step=args.step)
+                model = fit_final(dfH, H, m, extra_drop=("series_id",), categorical=("series_code",))
+                mpath = config.MODELS_DIR / f"{m}_h{H}_lng_panel_{tag}.joblib"
+                joblib.dump(model, mpath)
+                print(f"[OK] saved {mpath}")
+
+                for sid, dfS in dfH.groupby("series_id", sort=True):
+                    fc = forecast_last(model, dfS, H, args.forecast_rows, extra_drop=("series_id",))
+                    bt_s = bt.loc[bt["series_id"] == sid].drop(columns="series_id").reset_index(drop=True)
+                    _write_series_reports(sid, H, m, args.panel_mode, bt_s, fc)
+            else:
+                jobs = [(sid, dfS, H, m, args.min_train_days, args.step, args.forecast_rows)
+                        for sid, dfS in dfH.groupby("series_id", sort=True)]
+                with ProcessPoolExecutor(max_workers=args.n_jobs) as pool:
+                    for sid, bt, model, fc in pool.map(_run_series, jobs):
+                        mpath = config.MODELS_DIR / f"{m}_h{H}_lng_{sid}_{tag}.joblib"
+                        joblib.dump(model, mpath)
+                        print(f"[OK] saved {mpath}")
+                        _write_series_reports(sid, H, m, args.panel_mode, bt, fc)
+
+def load_intraday(freq: str, chunk_rows: int = 200_000):
+    """Intraday feature table as (X float32 DataFrame, {H: target array}, dates).
+
+    Read in chunks with float32 dtypes straight from the CSV, so the float64 table is never
+    materialised. X is a single float32 block, so per-fold row slices are views; each fit still
+    copies its training rows once (hgb validates to float64, rf/ridge go through the imputer).
+    """
+    path = features_path(freq)
+    cols = pd.read_csv(path, nrows=0).columns
+    tcols = [c for c in cols if c.startswith("target_t+")]
+    fcols = [c for c in cols if c != "date" and c not in tcols]
+    dtypes = {c: np.float32 for c in fcols + tcols}
+    X, T, D = [], [], []
+    for ch in pd.read_csv(path, dtype=dtypes, parse_dates=["date"], chunksize=chunk_rows):
+        X.append(ch[fcols].to_numpy(dtype=np.float32))
+        T.append(ch[tcols].to_numpy(dtype=np.float32))
+        D.append(ch["date"].to_numpy())
+    X = pd.DataFrame(np.concatenate(X), columns=fcols, copy=False)
+    T = np.concatenate(T)
+    targets = {int(c.split("+")[1]): T[:, j] for j, c in enumerate(tcols)}
+    return X, targets, pd.Series(np.concatenate(D), name="date")
+
+def walk_forward_intraday(X: pd.DataFrame, y: np.ndarray, dates: pd.Series, H: int, model_name: str,
+                          delta: pd.Timedelta, min_train: int, step: int, n_jobs: int = -1) -> pd.DataFrame:
+    """Expanding-window backtest on an intraday grid; `min_train` and `step` are in rows."""
+    model = make_model(model_name, n_jobs=n_jobs, large=True)
+    parts = []
+    for i in fold_starts(len(X), min_train, step):
+        hi = min(i + step, len(X))
+        model.fit(X.iloc[:i], y[:i])
+        parts.append((i, hi, model.predict(X.iloc[i:hi])))
+    if not parts:
+        return pd.DataFrame(columns=["date_input", "target_date", "y_true", "y_hat"])
+    idx = np.concatenate([np.arange(lo, hi) for lo, hi, _ in parts])
+    date_input = dates.iloc[idx].reset_index(drop=True)
+    return pd.DataFrame({
+        "date_input": date_input,
+        "target_date": date_input + H * delta,
+        "y_true": y[idx],
+        "y_hat": np.concatenate([p for _, _, p in parts]),
+    })
+
+def forecast_intraday(model, X: pd.DataFrame, dates: pd.Series, H: int, delta: pd.Timedelta,
+                      rows: int) -> pd.DataFrame:
+    """Forecast of the last `rows` rows of an intraday feature table."""
+    date_input = dates.iloc[-rows:].reset_index(drop=True)
+    return pd.DataFrame({
+        "date_input": date_input,
+        "target_date": date_input + H * delta,
+        "y_hat": model.predict(X.iloc[-rows:]),
+    })
+
+def run_intraday(args) -> None:
+    import joblib
+    t0 = time.perf_counter()
+    spec = FREQS[args.freq]
+    X, targets, dates = load_intraday(args.freq, args.chunk_rows)
+    print(f"[INFO] {features_path(args.freq)}: {X.shape[0]} rows x {X.shape[1]} features "
+          f"({X.to_numpy().nbytes / 2**20:.0f} MB float32)")
+    out_dir = config.REPORTS_DIR / spec.tag
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for H in args.horizons or list(targets):
+        if H not in targets:
+            raise KeyError(f"target_t+{H} not in {features_path(args.freq)}; rebuild features with --horizons {H}")
+        y = targets[H]
+        for m in args.models:
+            bt = walk_forward_intraday(X, y, dates, H, m, spec.delta, min_train=args.min_train_days * spec.per_day,
+                                       step=args.step * spec.per_day)
+            bt_path = out_dir / f"backtest_h{H}_{m}.csv"
+            bt.to_csv(bt_path, index=False)
+            print(f"[OK] wrote {bt_path} rows={len(bt)}")
+
+            model = make_model(m, large=True)
+            model.fit(X, y)
+            mpath = config.MODELS_DIR / f"{m}_h{H}_lng_{spec.tag}_{utc_now_tag()}.joblib"
+            joblib.dump(model, mpath)
+            print(f"[OK] saved {mpath}")
+
+            out = forecast_intraday(model, X, dates, H, spec.delta, args.forecast_rows)
+            fpath = out_dir / f"forecast_h{H}_{m}.csv"
+            out.to_csv(fpath, index=False)
+            print(f"[OK] wrote {fpath} rows={len(out)}")
+
+    rss = peak_rss_mb()
+    print(f"[INFO] {time.perf_counter() - t0:.1f}s" + (f", peak RSS {rss:.0f} MB" if rss else ""))
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--models", nargs="+", default=["hgb","rf","ridge"], choices=["hgb","rf","ridge"])
-    ap.add_argument("--horizons", nargs="+", type=int, default=[7,30])
+    ap.add_argument("--horizons", nargs="+", type=int, default=None,
+                    help="Default: 7 30 daily; every target in the feature table intraday (in grid steps).")
     ap.add_argument("--min_train_days", type=int, default=365)
-    ap.add_argument("--step", type=int, default=7)
+    ap.add_argument("--step", type=int, default=7, help="Days between folds (and test days per fold).")
     ap.add_argument("--forecast_rows", type=int, default=30, help="How many last rows to forecast for QA.")
+    ap.add_argument("--freq", default="D", choices=["D"] + list(FREQS),
+                    help="H / 15min train on data/features_lng_{hourly|15min}.csv (see features_lng --freq).")
+    ap.add_argument("--chunk_rows", type=int, default=200_000, help="Intraday: CSV rows read per chunk.")
+    ap.add_argument("--panel", action="store_true", help="Train on data/features_lng_panel.csv (see features_lng --panel).")
+    ap.add_argument("--panel_mode", default="global", choices=["global", "per_series"])
+    ap.add_argument("--n_jobs", type=int, default=None, help="Worker processes for --panel_mode per_series (default: CPU count).")
+    ap.add_argument("--vintage_map", default="",
+                    help='JSON (or @file.json) {feature_col: store_series}, e.g. {"y": "lng_feedgas"}. '
+                         'Backtest folds then use values as known at each fold date (single-series mode).')
+    ap.add_argument("--vintage_db", default=None, help="Vintage store path (default data/vintages.sqlite).")
+    ap.add_argument("--vintage_missing", default="earliest", choices=["earliest", "skip", "fail"],
+                    help="Folds before a mapped series' first fetch: use its earliest vintage (warns), "
+                         "skip them, or stop.")
     args = ap.parse_args()
 
-    df = pd.read_csv(DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+    if args.freq != "D":
+        if args.panel or args.vintage_map:
+            ap.error("--panel and --vintage_map are daily only")
+        run_intraday(args)
+        return
+    args.horizons = args.horizons or [7, 30]
+    if args.panel:
+        run_panel(args)
+        return
+
+    df = pd.read_csv(config.DATA_DIR/"features_lng.csv", parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+
+    import joblib
+    vintages = try_json_load(args.vintage_map)
+    store = VintageStore(args.vintage_db or DEFAULT_DB) if vintages else None
 
     for H in args.horizons:
         target = f"target_t+{H}"
@@ -90,32 +430,23 @@ def main():
         dfH = df.loc[keep].reset_index(drop=True)
 
         for m in args.models:
-            bt = walk_forward(dfH, H, m, min_train_days=args.min_train_days, step=args.step)
-            bt_path = REPORTS_DIR / f"backtest_h{H}_{m}.csv"
+            bt = walk_forward(dfH, H, m, min_train_days=args.min_train_days, step=args.step,
+                              store=store, vintages=vintages, vintage_missing=args.vintage_missing)
+            bt_path = config.REPORTS_DIR / f"backtest_h{H}_{m}.csv"
             bt.to_csv(bt_path, index=False)
             print(f"[OK] wrote {bt_path} rows={len(bt)}")
 
             # final fit on all for forecasting
-            X_all = numeric_only(dfH, drop_cols=("date",) + tuple([c for c in dfH.columns if c.startswith('target_t+')]))
-            y_all = dfH[target].astype(float)
-            model = make_model(m)
-            model.fit(X_all, y_all)
+            model = fit_final(dfH, H, m)
 
             tag = utc_now_tag()
-            mpath = MODELS_DIR / f"{m}_h{H}_lng_{tag}.joblib"
+            mpath = config.MODELS_DIR / f"{m}_h{H}_lng_{tag}.joblib"
             joblib.dump(model, mpath)
             print(f"[OK] saved {mpath}")
 
             # forecast last N rows (QA)
-            last = dfH.tail(args.forecast_rows).reset_index(drop=True)
-            Xp = numeric_only(last, drop_cols=("date",) + tuple([c for c in last.columns if c.startswith('target_t+')]))
-            yhat = model.predict(Xp)
-            out = pd.DataFrame({
-                "date_input": last["date"],
-                "target_date": last["date"] + pd.to_timedelta(H, unit="D"),
-                "y_hat": yhat
-            })
-            fpath = REPORTS_DIR / f"forecast_h{H}_{m}.csv"
+            out = forecast_last(model, dfH, H, args.forecast_rows)
+            fpath = config.REPORTS_DIR / f"forecast_h{H}_{m}.csv"
             out.to_csv(fpath, index=False)
             print(f"[OK] wrote {fpath} rows={len(out)}")
 
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import time
 from datetime import datetime, timezone
@@ -53,3 +54,13 @@ def numeric_only(df: pd.DataFrame, drop_cols=("date",)) -> pd.DataFrame:
             X[c] = pd.to_numeric(X[c], errors="coerce")
     X = X.replace([float("inf"), float("-inf")], pd.NA)
     return X
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where `resource` is unavailable, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
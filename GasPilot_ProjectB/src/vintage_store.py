@@ -0,0 +1,19 @@
+"""Project B point-in-time store (engine: gaspilot_shared/vintage_store.py).
+
+Storage: data/vintages.sqlite (DEFAULT_DB; VintageStore creates data/ when it opens the file)
+
+CLI (PowerShell):
+  python -m src.vintage_store --series RNGWHHD --as_of 2023-06-01 --out data/RNGWHHD_asof_20230601.csv
+  python -m src.vintage_store --list
+"""
+from src import config  # also puts the repo root (gaspilot_shared/) on sys.path
+from gaspilot_shared import vintage_store as _engine
+from gaspilot_shared.vintage_store import VintageStore  # noqa: F401  (re-exported for train_lng, tools/)
+
+DEFAULT_DB = config.PROJECT_ROOT / "data" / "vintages.sqlite"
+
+def main():
+    _engine.main(DEFAULT_DB)
+
+if __name__ == "__main__":
+    main()
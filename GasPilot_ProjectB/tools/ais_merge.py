@@ -7,26 +7,103 @@ Expected input (one or many CSVs) with at least:
   - event_type (optional; e.g., DEPARTURE / ARRIVAL)
 If you only have departures, that is fine.
 
+Geofence mode (--geofence) works from raw position pings instead of events:
+  timestamp, vessel id (MMSI/IMO), lat, lon
+Each ping is classified against terminal polygons (src/geofence.py; built-in approximate boxes
+or --terminals CSV/GeoJSON) in vectorised chunks, and arrivals / departures are derived from
+enter / exit transitions per vessel. Files are streamed in --chunk_rows chunks and scanned in
+parallel (--workers); only state-change pings are kept in memory. Files should be
+time-partitioned (e.g. one per day) so each vessel's pings come in time order across files.
+
 Outputs:
   data/external/ais_daily.csv with:
     date, departures, arrivals (if available), unique_vessels
+  geofence mode adds per-terminal columns
+    {terminal}_arrivals, {terminal}_departures, {terminal}_vessels (distinct vessels in port)
+  and the nation-wide columns are the totals over terminals.
+
+Example (PowerShell):
+  python tools/ais_merge.py --geofence --input_glob "data/external/ais_pings_*.csv" --workers 4
 """
-import argparse, glob
+import argparse, glob, sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.geofence import TERMINALS, GeofenceIndex, load_terminals, scan_file, compress_states, visits, daily_terminal_counts
+
+VESSEL_COLS = ["vessel_id","mmsi","MMSI","imo","IMO"]
+
+def find_col(cols, preferred, variants):
+    for c in [preferred] + variants:
+        if c in cols:
+            return c
+    raise KeyError(f"None of {[preferred] + variants} in columns {list(cols)}")
+
+def merge_geofence(args, files) -> pd.DataFrame:
+    terminals = load_terminals(args.terminals) if args.terminals else TERMINALS
+    index = GeofenceIndex(terminals, cell_deg=args.cell_deg)
+
+    head = pd.read_csv(files[0], nrows=0).columns
+    scan = partial(scan_file, index=index,
+                   time_col=find_col(head, args.time_col, ["time","datetime","ts","Timestamp","DateTime","BaseDateTime"]),
+                   vessel_col=find_col(head, VESSEL_COLS[0], VESSEL_COLS[1:]),
+                   lat_col=find_col(head, args.lat_col, ["lat","latitude","LAT","Latitude"]),
+                   lon_col=find_col(head, args.lon_col, ["lon","lng","longitude","LON","Longitude"]),
+                   chunk_rows=args.chunk_rows, time_format=args.time_format)
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            parts = list(pool.map(scan, files))
+    else:
+        parts = [scan(f) for f in files]
+    states = compress_states(pd.concat(parts, ignore_index=True))
+    print(f"[INFO] {len(files)} files -> {len(states)} state-change pings, {states['vessel'].nunique()} vessels")
+
+    calls = visits(states, index.names, min_dwell_hours=args.min_dwell_hours, merge_gap_hours=args.merge_gap_hours)
+    print(f"[INFO] {len(calls)} port calls at {calls['terminal'].nunique()} of {len(index.names)} terminals")
+    t = states["time"]
+    days = pd.date_range(t.min().floor("D"), t.max().floor("D"), freq="D") if len(t) else None
+    wide = daily_terminal_counts(calls, index.names, days)
+
+    # nation-wide columns keep the event-mode names (features_lng builds dep_7d / dep_14d from departures)
+    for c in ("arrivals", "departures"):
+        wide[c] = wide[[x for x in wide.columns if x.endswith(f"_{c}")]].sum(axis=1).astype(int)
+    stay_days = daily_terminal_counts(calls.assign(terminal="all"), ["all"], days)
+    wide["unique_vessels"] = stay_days["all_vessels"].to_numpy()
+    lead = ["date", "departures", "arrivals", "unique_vessels"]
+    return wide[lead + [c for c in wide.columns if c not in lead]]
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--input_glob", required=True, help="Glob to AIS CSVs, e.g., data/external/ais_*.csv")
     ap.add_argument("--time_col", default="timestamp")
     ap.add_argument("--event_col", default="event_type")
     ap.add_argument("--out", default="data/external/ais_daily.csv")
+    ap.add_argument("--geofence", action="store_true", help="Derive per-terminal events from lat/lon pings.")
+    ap.add_argument("--terminals", default=None, help="Terminal polygons (CSV terminal,lon,lat or GeoJSON); default built-in boxes.")
+    ap.add_argument("--lat_col", default="lat")
+    ap.add_argument("--lon_col", default="lon")
+    ap.add_argument("--time_format", default=None, help="strftime format of --time_col (faster than inference).")
+    ap.add_argument("--cell_deg", type=float, default=0.01, help="Grid index cell size in degrees.")
+    ap.add_argument("--chunk_rows", type=int, default=1_000_000)
+    ap.add_argument("--workers", type=int, default=1, help="Files scanned in parallel processes.")
+    ap.add_argument("--min_dwell_hours", type=float, default=1.0, help="Shorter stays in a fence are transits, not calls.")
+    ap.add_argument("--merge_gap_hours", type=float, default=6.0, help="Re-entries within this gap continue the same call.")
     args = ap.parse_args()
 
     files = sorted(glob.glob(args.input_glob))
     if not files:
         raise FileNotFoundError(f"No files matched {args.input_glob}")
 
+    if args.geofence:
+        out = merge_geofence(args, files)
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        out.to_csv(args.out, index=False)
+        print(f"[OK] wrote {args.out} rows={len(out)} cols={len(out.columns)}")
+        return
+
     dfs = []
     for f in files:
         df = pd.read_csv(f)
@@ -57,7 +134,7 @@ def main():
 
     # unique vessels
     vid = None
-    for c in ["vessel_id","mmsi","MMSI","imo","IMO"]:
+    for c in VESSEL_COLS:
         if c in all_df.columns:
             vid = c; break
     if vid:
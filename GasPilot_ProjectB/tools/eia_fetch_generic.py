@@ -9,11 +9,17 @@ Usage examples (PowerShell):
 
 For LNG feedgas/exports, first discover valid route/series via EIA Open Data "Series ID Search" tool.
 See docs/PIPELINE.md.
+
+Each fetch is also appended to the point-in-time store (data/vintages.sqlite, see src/vintage_store.py)
+under --vintage_series (default: --series), so earlier vintages survive the CSV overwrite.
 """
-import os, argparse, requests
+import os, sys, argparse
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.vintage_store import VintageStore, DEFAULT_DB
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--route", required=True, help="EIA v2 route path, e.g., natural-gas/pri/fut/data")
@@ -22,6 +28,8 @@ def main():
     ap.add_argument("--start", default="2017-01-01")
     ap.add_argument("--end", default=None)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--vintage_series", default=None, help="Series name in the vintage store (default: --series)")
+    ap.add_argument("--no_vintage", action="store_true", help="Do not record this fetch in the vintage store")
     args = ap.parse_args()
 
     key = os.environ.get("EIA_API_KEY", "").strip()
@@ -41,6 +49,7 @@ def main():
     if args.end:
         params["end"] = args.end
 
+    import requests
     r = requests.get(url, params=params, timeout=90)
     r.raise_for_status()
     js = r.json()
@@ -57,5 +66,11 @@ def main():
     df.to_csv(out, index=False)
     print(f"[OK] wrote {out} rows={len(df)}")
 
+    if not args.no_vintage:
+        name = args.vintage_series or args.series
+        with VintageStore(DEFAULT_DB) as store:
+            n = store.append(name, df, value_col=args.series, source=f"eia:{args.route}")
+        print(f"[OK] vintage {name}: {n} new/revised rows")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Unified GasPilot command line for Project A (Henry Hub) and Project B (LNG flows).
+
+Usage:
+  python gaspilot.py [--project A|B] <command> [command args...]
+  python gaspilot.py --project B train --models hgb --horizons 7
+  python gaspilot.py --project B train --help     # help of the underlying script
+
+Commands (project -> script):
+  fetch-eia     A: tools/eia_smoketest.py        B: tools/eia_fetch_generic.py
+  fetch-agsi    A: tools/get_agsi_eu.py
+  ingest-pjm    A: src/pjm_gen_by_fuel.py
+  ingest-ercot  A: src/ercot_renewables.py
+  ais-merge                                       B: tools/ais_merge.py
+  features      A: tools/build_features_lite.py  B: src/features_lng.py
+  feature-search  A: src/feature_search.py       B: src/feature_search.py
+  train         A: tools/train_predict_lite.py   B: src/train_lng.py
+  backtest-progressive                            B: src/backtest_progressive.py
+  forecast                                        B: src/forecast_lng.py
+  metrics                                         B: src/report_metrics.py
+  scenario                                        B: src/scenario_lng.py
+  vintages      A: src/vintage_store.py          B: src/vintage_store.py
+  bench-startup  check cold-start time of this CLI and of every `<command> --help`
+                 (exit 1 if over budget, if a heavy module is imported or if a file is created)
+                 gaspilot.py bench-startup [--budget_ms 300] [--repeats 5] [--command_budget_ms 1000]
+
+Project A has no predict-only script yet (`train` fits and forecasts in one run).
+
+Startup stays cheap: this file imports only the standard library. The selected script
+(and with it pandas / numpy / scikit-learn / joblib) is loaded only when a command runs, and
+the scripts parse their arguments before importing scikit-learn / joblib / requests or
+touching data/, models/ and reports/, so `<command> --help` stays cheap and side-effect free.
+It runs with its project directory as working directory and first sys.path entry, so the
+relative paths in each project's README keep working; the repository root stays on sys.path
+for gaspilot_shared/ (engines used by both projects). --project defaults to
+$GASPILOT_PROJECT; commands that exist in one project only pick it automatically.
+"""
+
+import os
+import sys
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = {
+    "A": os.path.join(ROOT, "GasPilot-ProjectA"),
+    "B": os.path.join(ROOT, "GasPilot_ProjectB"),
+}
+
+# command -> {project: script path (tools/*.py) or module name (src.*)}
+COMMANDS = {
+    "fetch-eia": {"A": "tools/eia_smoketest.py", "B": "tools/eia_fetch_generic.py"},
+    "fetch-agsi": {"A": "tools/get_agsi_eu.py"},
+    "ingest-pjm": {"A": "src.pjm_gen_by_fuel"},
+    "ingest-ercot": {"A": "src.ercot_renewables"},
+    "ais-merge": {"B": "tools/ais_merge.py"},
+    "features": {"A": "tools/build_features_lite.py", "B": "src.features_lng"},
+    "feature-search": {"A": "src.feature_search", "B": "src.feature_search"},
+    "train": {"A": "tools/train_predict_lite.py", "B": "src.train_lng"},
+    "backtest-progressive": {"B": "src.backtest_progressive"},
+    "forecast": {"B": "src.forecast_lng"},
+    "metrics": {"B": "src.report_metrics"},
+    "scenario": {"B": "src.scenario_lng"},
+    "vintages": {"A": "src.vintage_store", "B": "src.vintage_store"},
+}
+
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "joblib", "requests")
+# `<command> --help` may load pandas / numpy with the project script, but not these
+COMMAND_HEAVY_MODULES = ("sklearn", "joblib", "requests")
+
+
+def resolve(command: str, project: str | None) -> tuple:
+    targets = COMMANDS[command]
+    if project is None:
+        if len(targets) != 1:
+            raise SystemExit(f"[ERR] '{command}' exists in projects {sorted(targets)}; pass --project or set GASPILOT_PROJECT")
+        project = next(iter(targets))
+    project = project.upper()
+    if project not in targets:
+        raise SystemExit(f"[ERR] '{command}' is not available in project {project} (available: {sorted(targets)})")
+    return project, targets[project]
+
+
+def run(project: str, target: str, argv: list) -> None:
+    import runpy
+
+    root = PROJECTS[project]
+    os.chdir(root)
+    sys.path.insert(0, root)
+    if target.endswith(".py"):
+        path = os.path.join(root, target)
+        sys.argv = [path] + argv
+        runpy.run_path(path, run_name="__main__")
+    else:
+        sys.argv = [target] + argv
+        runpy.run_module(target, run_name="__main__", alter_sys=True)
+
+
+def timed_help(args: list) -> tuple:
+    """Run `gaspilot.py <args>` in a fresh interpreter: (seconds, returncode, top-level modules imported)."""
+    import subprocess
+    import time
+
+    t0 = time.perf_counter()
+    res = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__)] + args,
+                         capture_output=True, text=True)
+    dt = time.perf_counter() - t0
+    # "import time:  self [us] | cumulative | imported package"
+    mods = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in res.stderr.splitlines()
+            if line.startswith("import time:")}
+    return dt, res.returncode, mods
+
+
+def file_tree(root: str) -> set:
+    # byte-code caches written by the import system are not a side effect of the command
+    return {os.path.join(d, n) for d, dirs, files in os.walk(root) for n in dirs + files
+            if "__pycache__" not in os.path.join(d, n)}
+
+
+def bench_startup(budget_s: float, repeats: int) -> int:
+    """Time `gaspilot.py --help` in fresh interpreters and check no heavy module is imported."""
+    best = float("inf")
+    heavy = set()
+    for _ in range(repeats):
+        dt, _, mods = timed_help(["--help"])
+        best = min(best, dt)
+        heavy |= mods & set(HEAVY_MODULES)
+
+    ok = best <= budget_s and not heavy
+    print(f"[{'OK' if ok else 'ERR'}] cold start {best * 1000:.0f} ms (budget {budget_s * 1000:.0f} ms, best of {repeats})"
+          + (f"; heavy imports at startup: {sorted(heavy)}" if heavy else ""))
+    return 0 if ok else 1
+
+
+def bench_commands(budget_s: float) -> int:
+    """Run `<command> --help` once per command and project; check time, exit code, imports and side effects."""
+    failed = 0
+    for command, targets in COMMANDS.items():
+        for project in sorted(targets):
+            before = file_tree(PROJECTS[project])
+            dt, code, mods = timed_help(["--project", project, command, "--help"])
+            created = sorted(os.path.relpath(p, PROJECTS[project]) for p in file_tree(PROJECTS[project]) - before)
+            heavy = sorted(mods & set(COMMAND_HEAVY_MODULES))
+            problems = ([f"over budget ({budget_s * 1000:.0f} ms)"] if dt > budget_s else []) \
+                + ([f"exit code {code}"] if code != 0 else []) \
+                + ([f"heavy imports: {heavy}"] if heavy else []) \
+                + ([f"created: {created}"] if created else [])
+            failed += bool(problems)
+            print(f"[{'ERR' if problems else 'OK'}] {project} {command} --help {dt * 1000:.0f} ms"
+                  + (f"; {'; '.join(problems)}" if problems else ""))
+    return 0 if failed == 0 else 1
+
+
+def bench_main(argv: list) -> int:
+    ap = argparse.ArgumentParser(prog="gaspilot bench-startup",
+                                 description="Time `gaspilot.py --help` and every `<command> --help` "
+                                             "in fresh interpreters.")
+    ap.add_argument("--budget_ms", type=float, default=300.0, help="Max cold-start time of `gaspilot.py --help`")
+    ap.add_argument("--repeats", type=int, default=5, help="Runs of `gaspilot.py --help` (best time counts)")
+    ap.add_argument("--command_budget_ms", type=float, default=1000.0,
+                    help="Max time of each `<command> --help` (one run each; pandas may load)")
+    args = ap.parse_args(argv)
+    rc = bench_startup(args.budget_ms / 1000.0, args.repeats)
+    return bench_commands(args.command_budget_ms / 1000.0) or rc
+
+
+def main(argv: list | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="gaspilot",
+        description="GasPilot pipelines. Arguments after the command are passed to the project script.",
+        epilog="Commands: " + ", ".join(list(COMMANDS) + ["bench-startup"]),
+    )
+    ap.add_argument("--project", "-p", type=str.upper, choices=sorted(PROJECTS),
+                    default=os.environ.get("GASPILOT_PROJECT") or None)
+    ap.add_argument("command", choices=list(COMMANDS) + ["bench-startup"], metavar="command")
+    ap.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the command")
+    args = ap.parse_args(argv)
+
+    if args.command == "bench-startup":
+        return bench_main(args.args)
+
+    project, target = resolve(args.command, args.project)
+    run(project, target, args.args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
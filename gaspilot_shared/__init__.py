@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Engines shared by Project A (Henry Hub) and Project B (LNG flows).
+
+  asof_join       single-pass as-of join of many sources onto a daily grid
+  vintage_store   point-in-time SQLite store of every fetch
+  feature_search  lag / rolling-window search scored on cached ridge Gram matrices
+
+Each project keeps only a thin src/ wrapper with its own paths and defaults, and puts the
+repository root on sys.path so this package imports the same way from `python -m src.x`,
+from tools/ scripts and from gaspilot.py.
+"""
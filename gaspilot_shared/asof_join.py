@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Single-pass as-of join of many sources onto one daily grid.
+
+Each source declares how its observations become known:
+  - freq      D / W / M — period covered by one row
+  - date_is   "end" if `date` is the last day of the period (EIA weekly week-ending dates),
+              "start" if it is the first day (monthly series dated YYYY-MM-01)
+  - lag_days  publication lag after the period end
+
+An observation is usable from `available = period_end + lag_days` onwards. For every
+grid day the engine takes the latest observation already available (np.searchsorted on
+the sorted availability dates), i.e. forward-fill only: nothing is ever filled backwards
+and no value is used before it was published. All columns are written into one
+preallocated frame instead of a chain of growing merges.
+"""
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    freq: str = "D"
+    lag_days: int = 0
+    date_is: str = "end"
+    required: bool = False
+    rename: dict = field(default_factory=dict)
+
+
+def period_end(dates: pd.Series, freq: str, date_is: str = "end") -> pd.Series:
+    dates = pd.to_datetime(dates)
+    if date_is == "end" or freq == "D":
+        return dates
+    if freq == "W":
+        return dates + pd.Timedelta(days=6)
+    if freq == "M":
+        return dates + pd.offsets.MonthEnd(0)
+    raise ValueError(f"freq must be one of D, W, M; got {freq}")
+
+
+def available_dates(dates: pd.Series, src: Source) -> pd.Series:
+    """First day on which each observation of `src` is known."""
+    return period_end(dates, src.freq, src.date_is) + pd.Timedelta(days=src.lag_days)
+
+
+def with_overrides(sources: list, overrides: dict) -> list:
+    """Apply {source name: {field: value}} overrides (e.g. from a JSON CLI flag)."""
+    unknown = set(overrides) - {s.name for s in sources}
+    if unknown:
+        raise KeyError(f"Unknown source(s) in overrides: {sorted(unknown)}")
+    return [replace(s, **overrides.get(s.name, {})) for s in sources]
+
+
+def asof_join(grid: pd.DatetimeIndex, frames: list, date_col: str = "date") -> pd.DataFrame:
+    """Align [(Source, DataFrame), ...] onto `grid` in one pass.
+
+    Returns a frame with `date_col` = grid followed by every non-date column of every source
+    (after `Source.rename`). Days before a column's first available value stay NaN.
+    """
+    grid = pd.DatetimeIndex(grid)
+    gv = grid.values
+    cols = {date_col: grid}
+    for src, df in frames:
+        df = df.rename(columns=src.rename)
+        avail = available_dates(df[date_col], src)
+        order = np.argsort(avail.values, kind="stable")
+        av = avail.values[order]
+        for c in df.columns:
+            if c == date_col:
+                continue
+            if c in cols:
+                raise ValueError(f"Column {c!r} from {src.name} already provided by another source; use rename.")
+            v = df[c].to_numpy()[order]
+            ok = ~pd.isna(v)
+            a, v = av[ok], v[ok]
+            if len(v) == 0:
+                cols[c] = np.full(len(gv), np.nan)
+                continue
+            pos = np.searchsorted(a, gv, side="right") - 1
+            cols[c] = pd.Series(v[np.clip(pos, 0, None)]).where(pos >= 0).to_numpy()
+    return pd.DataFrame(cols)
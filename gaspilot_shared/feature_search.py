@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""Automated lag / rolling-window feature search with a cheap ridge proxy.
+
+Builds a candidate pool from the raw columns of the feature table:
+  - target: lags 1..14, 21, 28, 35, 60, 90; rolling means and std over several windows
+  - every other input (PJM fuel mix, AIS counts, weather, ...): lags 0..3, 7, 14, 30 and rolling means
+  - calendar columns as they are
+and scores them with greedy forward selection of a ridge regression on `target_t+{H}`.
+
+Lags, windows, H, fold purge and --min_train_days are in calendar days. A table with gaps
+(Project A's Henry Hub rows are trading days) is first reindexed to a daily grid with the
+last observation carried forward, so `henry_hub_lag7` is the last price known 7 days earlier.
+Only the table's own rows are scored; the inserted days only feed the lags and windows.
+
+Scoring never refits on the data: the table is passed over once to accumulate raw
+moments [X, y, 1]' [X, y, 1] per segment between fold boundaries. Each fold's train
+(expanding window, purged by H rows) and validation Gram matrices are prefix sums of
+those. Forward selection then works on the p x p matrices only. Every step scores all
+remaining candidates at once from the fold's Cholesky factor of the selected block, and
+the factor is extended by one row when a feature is added. A final backward pass drops
+selected features whose removal costs less than --min_gain.
+
+Reads: the project's feature table (or --features)
+Writes:
+  reports/feature_search_h{H}.csv   (step, feature, kind, source, param, rmse, gain, gain_pct,
+                                     folds_improved, drop_loss, kept)
+  reports/feature_spec_h{H}.json    (pruned spec: target lags/windows, per-source lags/windows,
+                                     calendar columns, selected names in selection order;
+                                     "unit": "calendar_day")
+
+CLI: `python -m src.feature_search` in either project (thin wrappers around main()).
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+CALENDAR = ("dow", "month", "is_wknd")
+TARGET_LAGS = tuple(range(1, 15)) + (21, 28, 35, 60, 90)
+TARGET_WINDOWS = (3, 7, 14, 21, 30, 60, 90)
+TARGET_SD_WINDOWS = (7, 30)
+SOURCE_LAGS = (0, 1, 2, 3, 7, 14, 30)
+SOURCE_WINDOWS = (7, 14, 30)
+# engineered columns already in the table; the pool rebuilds them from the raw inputs
+DERIVED_RE = re.compile(r"(_lag\d+|_ma\d+|_sd\d+|_\d+d)$|^target_t\+")
+
+
+def raw_sources(df: pd.DataFrame, target: str) -> list:
+    """Numeric input columns of the table that are neither target, calendar nor engineered."""
+    num = df.select_dtypes("number").columns
+    return [c for c in num if c != target and c not in CALENDAR and not DERIVED_RE.search(c)]
+
+
+def daily_grid(df: pd.DataFrame, date_col: str = "date") -> tuple:
+    """(table on a contiguous daily grid, bool mask of the table's own rows).
+
+    Inserted days carry the last observed value of every column forward.
+    """
+    dates = pd.DatetimeIndex(df[date_col])
+    grid = pd.date_range(dates.min(), dates.max(), freq="D")
+    if len(grid) == len(df):
+        return df, np.ones(len(df), dtype=bool)
+    observed = grid.isin(dates)
+    g = df.set_index(date_col)
+    out = g.reindex(grid)
+    out.loc[~observed] = out.ffill().loc[~observed]
+    return out.rename_axis(date_col).reset_index(), observed
+
+
+def candidate_pool(df: pd.DataFrame, target: str, sources: list) -> tuple:
+    """(values n x p, meta rows) for every candidate; meta: feature, kind, source, param."""
+    cols, meta = {}, []
+
+    def add(name, kind, src, param, values):
+        cols[name] = values
+        meta.append({"feature": name, "kind": kind, "source": src, "param": param})
+
+    y = df[target]
+    add(target, "level", target, 0, y)
+    for lag in TARGET_LAGS:
+        add(f"{target}_lag{lag}", "lag", target, lag, y.shift(lag))
+    for w in TARGET_WINDOWS:
+        add(f"{target}_ma{w}", "mean", target, w, y.rolling(w, min_periods=1).mean())
+    for w in TARGET_SD_WINDOWS:
+        add(f"{target}_sd{w}", "std", target, w, y.rolling(w, min_periods=2).std())
+    for c in sources:
+        x = df[c]
+        for lag in SOURCE_LAGS:
+            add(c if lag == 0 else f"{c}_lag{lag}", "lag", c, lag, x.shift(lag))
+        for w in SOURCE_WINDOWS:
+            add(f"{c}_ma{w}", "mean", c, w, x.rolling(w, min_periods=1).mean())
+    for c in CALENDAR:
+        if c in df.columns:
+            add(c, "calendar", c, 0, df[c])
+    return np.column_stack([np.asarray(v, dtype=float) for v in cols.values()]), pd.DataFrame(meta)
+
+
+def fold_bounds(n: int, H: int, folds: int, min_train: int) -> list:
+    """[(train_end, val_start, val_end)] in days: expanding train purged by H days, equal validation blocks."""
+    edges = np.linspace(min_train, n, folds + 1).astype(int)
+    return [(max(s - H, 0), s, e) for s, e in zip(edges[:-1], edges[1:]) if e > s]
+
+
+def fold_moments(Z: np.ndarray, y: np.ndarray, bounds: list) -> list:
+    """Raw moment matrices M = [Z, y, 1]'[Z, y, 1] for each fold's train and validation rows.
+
+    One pass: moments are accumulated per segment between consecutive boundaries and
+    prefix-summed, so no row is multiplied twice regardless of the number of folds.
+    """
+    cuts = sorted({0} | {b for f in bounds for b in f})
+    A = np.column_stack([Z, y, np.ones(len(y))])
+    prefix = {0: np.zeros((A.shape[1], A.shape[1]))}
+    for lo, hi in zip(cuts[:-1], cuts[1:]):
+        prefix[hi] = prefix[lo] + A[lo:hi].T @ A[lo:hi]
+    return [(prefix[t], prefix[e] - prefix[s]) for t, s, e in bounds]
+
+
+class FoldState:
+    """Standardised train/validation Gram blocks of one fold plus the Cholesky factor of the selection."""
+
+    def __init__(self, M_tr: np.ndarray, M_va: np.ndarray, alpha: float):
+        p = M_tr.shape[0] - 2
+        n = M_tr[-1, -1]
+        sx, sy = M_tr[-1, :p], M_tr[-1, p]
+        mu, ybar = sx / n, sy / n
+        var = np.diag(M_tr)[:p] / n - mu ** 2
+        self.valid = var > 1e-12 * np.maximum(1.0, mu ** 2)
+        sd = np.where(self.valid, np.sqrt(np.clip(var, 1e-300, None)), 1.0)
+
+        self.G = (M_tr[:p, :p] - n * np.outer(mu, mu)) / np.outer(sd, sd)
+        self.b = (M_tr[:p, p] - n * mu * ybar) / sd
+
+        nv = M_va[-1, -1]
+        vx, vy = M_va[-1, :p], M_va[-1, p]
+        self.V = (M_va[:p, :p] - np.outer(mu, vx) - np.outer(vx, mu) + nv * np.outer(mu, mu)) / np.outer(sd, sd)
+        self.c = (M_va[:p, p] - ybar * vx - mu * vy + nv * mu * ybar) / sd
+        self.yy = M_va[p, p] - 2 * ybar * vy + nv * ybar ** 2
+        self.n_val = nv
+        self.alpha = alpha
+        self.S = []
+        self.L = np.zeros((0, 0))
+
+    def sse(self, S=None) -> float:
+        """Validation SSE of the ridge fit on S (default: current selection)."""
+        S = self.S if S is None else list(S)
+        if not S:
+            return float(self.yy)
+        beta = np.linalg.solve(self.G[np.ix_(S, S)] + self.alpha * np.eye(len(S)), self.b[S])
+        return float(self.yy - 2 * self.c[S] @ beta + beta @ self.V[np.ix_(S, S)] @ beta)
+
+    def score_all(self) -> np.ndarray:
+        """Validation SSE of S + {j} for every candidate j (inf where j is selected or constant)."""
+        S, G, V = self.S, self.G, self.V
+        GS = G[S]                                           # k x p
+        T = np.linalg.solve(self.L, GS) if S else GS        # L^-1 G_S.
+        W = np.linalg.solve(self.L.T, T) if S else GS       # (G_SS + a I)^-1 G_S.
+        beta0 = np.linalg.solve(self.L.T, np.linalg.solve(self.L, self.b[S])) if S else np.zeros(0)
+
+        d2 = np.diag(G) + self.alpha - (T * T).sum(axis=0)  # Schur complement of the new pivot
+        bj = (self.b - GS.T @ beta0) / d2                    # new coefficient
+        bS = beta0[:, None] - W * bj                         # k x p: updated old coefficients
+        VS = V[S]
+        VSS = V[np.ix_(S, S)]
+        quad = (bS * (VSS @ bS)).sum(axis=0) + 2 * bj * (VS * bS).sum(axis=0) + bj ** 2 * np.diag(V)
+        lin = (self.c[S] @ bS) + self.c * bj
+        out = self.yy - 2 * lin + quad
+        out[~self.valid] = np.inf
+        out[S] = np.inf
+        return out
+
+    def add(self, j: int) -> None:
+        """Extend the Cholesky factor of G_SS + a I by feature j (O(k^2))."""
+        k = len(self.S)
+        l = np.linalg.solve(self.L, self.G[self.S, j]) if k else np.zeros(0)
+        d = np.sqrt(max(self.G[j, j] + self.alpha - l @ l, 1e-12))
+        L = np.zeros((k + 1, k + 1))
+        L[:k, :k] = self.L
+        L[k, :k] = l
+        L[k, k] = d
+        self.L = L
+        self.S.append(j)
+
+
+def forward_select(states: list, names: list, base: list, max_features: int, min_gain: float) -> list:
+    """Greedy forward selection on pooled validation MSE; returns one record per step."""
+    n_val = sum(s.n_val for s in states)
+    for j in base:
+        for s in states:
+            s.add(j)
+    per_fold = np.array([s.sse() for s in states])
+    rmse = np.sqrt(per_fold.sum() / n_val)
+    steps = [{"step": 0, "feature": names[j], "rmse": rmse, "gain": np.nan, "gain_pct": np.nan,
+              "folds_improved": np.nan} for j in base]
+
+    while len(states[0].S) < max_features:
+        scores = np.array([s.score_all() for s in states])   # folds x p
+        total = scores.sum(axis=0)
+        j = int(np.argmin(total))
+        if not np.isfinite(total[j]):
+            break
+        new_rmse = np.sqrt(max(total[j], 0.0) / n_val)
+        gain = rmse - new_rmse
+        if gain / rmse < min_gain:
+            break
+        steps.append({"step": len(steps), "feature": names[j], "rmse": new_rmse, "gain": gain,
+                      "gain_pct": 100.0 * gain / rmse,
+                      "folds_improved": int((scores[:, j] < per_fold).sum())})
+        for s in states:
+            s.add(j)
+        per_fold, rmse = scores[:, j], new_rmse
+    return steps
+
+
+def backward_prune(states: list, keep_fixed: list, min_gain: float) -> tuple:
+    """Drop selected features whose removal raises pooled RMSE by less than min_gain (relative).
+
+    Returns ({feature index: drop_loss in RMSE units}, final selection); for dropped features
+    the loss is the one at their removal.
+    """
+    n_val = sum(s.n_val for s in states)
+    S = list(states[0].S)
+    losses = {}
+    while True:
+        rmse = np.sqrt(sum(s.sse(S) for s in states) / n_val)
+        drop = {j: np.sqrt(sum(s.sse([i for i in S if i != j]) for s in states) / n_val) - rmse
+                for j in S if j not in keep_fixed}
+        losses.update(drop)
+        if not drop:
+            break
+        j = min(drop, key=drop.get)
+        if drop[j] / rmse >= min_gain:
+            break
+        S.remove(j)
+    return losses, S
+
+
+def feature_spec(meta: pd.DataFrame, selected: list, target: str, H: int) -> dict:
+    sel = meta.iloc[selected]
+    spec = {"horizon": H, "target": target, "unit": "calendar_day",
+            "target_lags": [], "target_windows": [], "target_sd_windows": [],
+            "sources": {}, "calendar": [], "selected": sel["feature"].tolist()}
+    for r in sel.itertuples():
+        if r.kind == "calendar":
+            spec["calendar"].append(r.source)
+        elif r.source == target:
+            key = {"lag": "target_lags", "mean": "target_windows", "std": "target_sd_windows"}.get(r.kind)
+            if key:
+                spec[key].append(int(r.param))
+        else:
+            src = spec["sources"].setdefault(r.source, {"lags": [], "windows": []})
+            src["lags" if r.kind == "lag" else "windows"].append(int(r.param))
+    for v in [spec["target_lags"], spec["target_windows"], spec["target_sd_windows"]] + \
+             [x for s in spec["sources"].values() for x in s.values()]:
+        v.sort()
+    return spec
+
+
+def search(df: pd.DataFrame, target: str, H: int, sources: list | None = None, folds: int = 4,
+           min_train: int = 365, alpha: float = 1.0, max_features: int = 25, min_gain: float = 0.002):
+    """Run the search; returns (report DataFrame, spec dict)."""
+    t0 = time.perf_counter()
+    sources = raw_sources(df, target) if sources is None else sources
+    df, observed = daily_grid(df)
+    Z, meta = candidate_pool(df, target, sources)
+    tcol = f"target_t+{H}"
+    yH = (df[tcol] if tcol in df.columns else df[target].shift(-H)).to_numpy(dtype=float)
+    # score the table's own rows only and drop the target's warm-up rows; covariate gaps (e.g. before
+    # a source's first publication) are imputed with the column mean, i.e. 0 after the rescale below
+    own = (meta["source"] == target).to_numpy()
+    ok = observed & ~np.isnan(yH) & ~np.isnan(Z[:, own]).any(axis=1)
+    Z, yH = Z[ok], yH[ok]
+    # fold boundaries are placed in days and mapped to the kept rows
+    day = np.flatnonzero(ok)
+    day = day - day[0] if len(day) else day
+    # global affine rescale for numerical stability of the raw moments (ridge scores are invariant)
+    mu, sd = np.nanmean(Z, axis=0), np.nanstd(Z, axis=0)
+    Z = np.nan_to_num((Z - mu) / np.where(sd > 0, sd, 1.0))
+
+    n_days = int(day[-1]) + 1 if len(day) else 0
+    bounds = [tuple(int(np.searchsorted(day, b)) for b in f) for f in fold_bounds(n_days, H, folds, min_train)]
+    if not bounds or bounds[0][0] < 30:
+        raise ValueError(f"Not enough rows ({len(Z)} over {n_days} days) for {folds} folds "
+                         f"after {min_train} training days")
+    states = [FoldState(Mt, Mv, alpha) for Mt, Mv in fold_moments(Z, yH, bounds)]
+    print(f"[INFO] h{H}: {Z.shape[1]} candidates from {len(sources)} sources, {len(Z)} rows over {n_days} days, "
+          f"{len(bounds)} folds")
+
+    names = meta["feature"].tolist()
+    base = [names.index(target)]
+    steps = forward_select(states, names, base, max_features, min_gain)
+    losses, final = backward_prune(states, base, min_gain)
+
+    rep = pd.DataFrame(steps).merge(meta, on="feature", how="left")
+    idx = {f: i for i, f in enumerate(names)}
+    rep["drop_loss"] = [losses.get(idx[f], np.nan) for f in rep["feature"]]
+    rep["kept"] = [idx[f] in final for f in rep["feature"]]
+    rep = rep[["step", "feature", "kind", "source", "param", "rmse", "gain", "gain_pct",
+               "folds_improved", "drop_loss", "kept"]]
+    rep["folds_improved"] = rep["folds_improved"].astype("Int64")
+    print(f"[INFO] h{H}: selected {len(steps)}, kept {len(final)} in {time.perf_counter() - t0:.1f}s; "
+          f"val RMSE {steps[0]['rmse']:.4f} -> {steps[-1]['rmse']:.4f}")
+    order = [idx[f] for f in rep["feature"] if idx[f] in final]
+    return rep, feature_spec(meta, order, target, H)
+
+
+def main(features_path: str, reports_dir: str, target_col: str, hint: str = "", argv: list | None = None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--features", default=str(features_path))
+    ap.add_argument("--target_col", default=target_col, help="Level column the targets are built from.")
+    ap.add_argument("--horizons", nargs="+", type=int, default=[7])
+    ap.add_argument("--sources", nargs="*", default=None, help="Input columns for cross-source lags (default: auto).")
+    ap.add_argument("--folds", type=int, default=4)
+    ap.add_argument("--min_train_days", type=int, default=365)
+    ap.add_argument("--alpha", type=float, default=1.0, help="Ridge penalty on standardised features.")
+    ap.add_argument("--max_features", type=int, default=25)
+    ap.add_argument("--min_gain", type=float, default=0.002,
+                    help="Stop / prune when a feature changes validation RMSE by less than this fraction.")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.features):
+        print(f"[ERR] Missing {args.features}" + (f"; {hint}" if hint else ""))
+        raise SystemExit(2)
+    os.makedirs(reports_dir, exist_ok=True)
+    df = pd.read_csv(args.features, parse_dates=["date"]).sort_values("date").reset_index(drop=True)
+    for H in args.horizons:
+        rep, spec = search(df, args.target_col, H, sources=args.sources, folds=args.folds,
+                           min_train=args.min_train_days, alpha=args.alpha,
+                           max_features=args.max_features, min_gain=args.min_gain)
+        rpath = os.path.join(reports_dir, f"feature_search_h{H}.csv")
+        rep.to_csv(rpath, index=False)
+        spath = os.path.join(reports_dir, f"feature_spec_h{H}.json")
+        with open(spath, "w", encoding="utf-8") as f:
+            json.dump(spec, f, indent=2)
+        print(f"[OK] wrote {rpath} and {spath}")
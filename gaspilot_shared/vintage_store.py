@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""Point-in-time (vintage) store for fetched series.
+
+Every fetch is appended as a timestamped delta instead of overwriting history:
+only observations that are new or whose value changed since the latest vintage
+are written. Rows are keyed by (series, date, asof) in a SQLite table whose
+primary key doubles as the lookup index, so "series as known at D" is an
+index range scan per series, not a scan of every fetch ever made.
+
+Storage: <project>/data/vintages.sqlite (each project's src/vintage_store.py sets DEFAULT_DB)
+  vintages(series, date, asof, value)   PRIMARY KEY (series, date, asof)
+  fetches(series, asof, source, rows, changed)
+
+Conventions:
+  - `asof` is the fetch time in UTC (naive ISO string).
+  - as_of(series, D) returns, for each observation date, the latest value
+    fetched at or before D (a date D means the start of that day).
+
+CLI: `python -m src.vintage_store` in either project (see main()).
+"""
+import argparse
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vintages (
+    series TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    asof   TEXT NOT NULL,
+    value  REAL,
+    PRIMARY KEY (series, date, asof)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fetches (
+    series  TEXT NOT NULL,
+    asof    TEXT NOT NULL,
+    source  TEXT,
+    rows    INTEGER,
+    changed INTEGER,
+    PRIMARY KEY (series, asof)
+);
+"""
+
+
+def _ts(x) -> str:
+    return pd.Timestamp(x).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class VintageStore:
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(str(self.path))
+        self.con.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, series: str, df: pd.DataFrame, value_col: str, date_col: str = "date",
+               asof=None, source: str | None = None) -> int:
+        """Record one fetch of `series`; returns the number of new/revised observations written."""
+        asof = _ts(asof if asof is not None else datetime.now(timezone.utc).replace(tzinfo=None))
+        new = pd.DataFrame({
+            "date": pd.to_datetime(df[date_col]).dt.strftime("%Y-%m-%d"),
+            "value": pd.to_numeric(df[value_col], errors="coerce"),
+        }).dropna(subset=["date"]).drop_duplicates("date", keep="last")
+
+        known = self.as_of(series, None)
+        known["date"] = known["date"].dt.strftime("%Y-%m-%d")
+        cur = new.merge(known, on="date", how="left", suffixes=("", "_known"), indicator=True)
+        both_nan = cur["value"].isna() & cur["value_known"].isna()
+        changed = (cur["_merge"] == "left_only") | ((cur["value"] != cur["value_known"]) & ~both_nan)
+        delta = cur.loc[changed, ["date", "value"]]
+
+        with self.con:
+            self.con.executemany(
+                "INSERT OR REPLACE INTO vintages (series, date, asof, value) VALUES (?, ?, ?, ?)",
+                [(series, d, asof, None if pd.isna(v) else float(v)) for d, v in delta.itertuples(index=False)],
+            )
+            self.con.execute(
+                "INSERT OR REPLACE INTO fetches (series, asof, source, rows, changed) VALUES (?, ?, ?, ?, ?)",
+                (series, asof, source, len(new), len(delta)),
+            )
+        return len(delta)
+
+    def as_of(self, series: str, asof=None) -> pd.DataFrame:
+        """(date, value) of `series` as known at `asof` (None = latest)."""
+        asof = "9999-12-31 23:59:59" if asof is None else _ts(asof)
+        # SQLite returns the bare `value` from the row that holds MAX(asof) within each group
+        rows = self.con.execute(
+            "SELECT date, value, MAX(asof) FROM vintages "
+            "WHERE series = ? AND asof <= ? GROUP BY date ORDER BY date",
+            (series, asof),
+        ).fetchall()
+        out = pd.DataFrame(rows, columns=["date", "value", "asof"]).drop(columns="asof")
+        out["date"] = pd.to_datetime(out["date"])
+        out["value"] = out["value"].astype(float)
+        return out
+
+    def first_asof(self, series: str) -> pd.Timestamp | None:
+        row = self.con.execute("SELECT MIN(asof) FROM fetches WHERE series = ?", (series,)).fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    def as_of_frame(self, columns: dict, asof, dates: pd.DatetimeIndex) -> pd.DataFrame:
+        """Wide frame on `dates` with one column per {column: series}, as known at `asof`.
+
+        Values are forward-filled only (no look-ahead); a series with no vintage at `asof`
+        yet falls back to its earliest recorded vintage, still cut at `asof` by date. That
+        vintage may hold later revisions, so such a frame is not point-in-time; callers can
+        check `fallback_columns` first.
+        """
+        out = pd.DataFrame(index=pd.DatetimeIndex(dates))
+        for col, series in columns.items():
+            s = self.as_of(series, asof)
+            if s.empty:
+                first = self.first_asof(series)
+                if first is None:
+                    raise KeyError(f"series not in vintage store: {series}")
+                s = self.as_of(series, first)
+                s = s[s["date"] <= pd.Timestamp(asof)]
+            out[col] = s.set_index("date")["value"].reindex(out.index, method="ffill")
+        return out
+
+    def fallback_columns(self, columns: dict, asof) -> list:
+        """Columns of {column: series} that `as_of_frame` fills from the earliest vintage at `asof`."""
+        asof = pd.Timestamp(asof)
+        return [col for col, series in columns.items()
+                if (first := self.first_asof(series)) is not None and first > asof]
+
+    def list_series(self) -> pd.DataFrame:
+        rows = self.con.execute(
+            "SELECT series, COUNT(*), MIN(asof), MAX(asof), SUM(changed) FROM fetches GROUP BY series ORDER BY series"
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["series", "fetches", "first_asof", "last_asof", "rows_written"])
+
+
+def main(default_db: Path | str, argv: list | None = None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=str(default_db))
+    ap.add_argument("--list", action="store_true", help="List stored series and their fetch history.")
+    ap.add_argument("--series", default=None)
+    ap.add_argument("--as_of", default=None, help="Date/time; default latest.")
+    ap.add_argument("--out", default=None, help="CSV path (date, <series>); prints head if omitted.")
+    args = ap.parse_args(argv)
+
+    with VintageStore(args.db) as store:
+        if args.list or not args.series:
+            print(store.list_series().to_string(index=False))
+            return
+        df = store.as_of(args.series, args.as_of).rename(columns={"value": args.series})
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.out, index=False)
+        print(f"[OK] wrote {args.out} rows={len(df)}")
+    else:
+        print(df.tail(10).to_string(index=False))